@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# measures order id updates of an L3 (indexed) order book with thousands of orders per price
+#
+#     python examples/py/benchmark-indexed-order-book.py [orders per price] [prices]
+#
+# the side that scanned the orders of a price linearly is kept below for comparison
+
+import bisect
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.async_support.base.ws.order_book_side import OrderBookSide, IndexedAsks  # noqa: E402
+
+
+class ScanningIndexedAsks(OrderBookSide):
+    side = False
+
+    def __init__(self, deltas=[], depth=None):
+        self._hashmap = {}
+        super(ScanningIndexedAsks, self).__init__([], depth)
+        for delta in deltas:
+            self.storeArray(list(delta))
+
+    def storeArray(self, delta):
+        price = delta[0]
+        size = delta[1]
+        order_id = delta[2]
+        index_price = price
+        if size:
+            if order_id in self._hashmap:
+                old_price = self._hashmap[order_id]
+                index_price = index_price or old_price
+                delta[0] = index_price
+                if index_price == old_price:
+                    index = bisect.bisect_left(self._index, index_price)
+                    while list.__getitem__(self, index)[2] != order_id:
+                        index += 1
+                    self._index[index] = index_price
+                    list.__setitem__(self, index, delta)
+                    return
+                old_index = bisect.bisect_left(self._index, old_price)
+                while list.__getitem__(self, old_index)[2] != order_id:
+                    old_index += 1
+                del self._index[old_index]
+                del self[old_index]
+            self._hashmap[order_id] = index_price
+            index = bisect.bisect_left(self._index, index_price)
+            while index < len(self._index) and self._index[index] == index_price and list.__getitem__(self, index)[2] < order_id:
+                index += 1
+            self._index.insert(index, index_price)
+            self.insert(index, delta)
+        elif order_id in self._hashmap:
+            old_price = self._hashmap[order_id]
+            index = bisect.bisect_left(self._index, old_price)
+            while list.__getitem__(self, index)[2] != order_id:
+                index += 1
+            del self._index[index]
+            del self[index]
+            del self._hashmap[order_id]
+
+
+def l3_stream(orders_per_price, prices, count=20000, seed=42):
+    generator = random.Random(seed)
+    snapshot = []
+    for price in range(prices):
+        for order in range(orders_per_price):
+            snapshot.append([100 + price * 0.5, 1.0, price * orders_per_price + order])
+    next_id = len(snapshot)
+    live = list(range(next_id))
+    messages = []
+    for _ in range(count):
+        action = generator.random()
+        if action < 0.6:
+            # a partial fill or an amendment of the size
+            messages.append([None, round(generator.random() * 10, 4) + 0.1, generator.choice(live)])
+        elif action < 0.8:
+            # a cancel and a new order keep the number of orders stable
+            position = generator.randrange(len(live))
+            messages.append([None, 0, live[position]])
+            live[position] = next_id
+            messages.append([100 + generator.randrange(prices) * 0.5, 1.0, next_id])
+            next_id += 1
+        else:
+            # an order moves to another price
+            messages.append([100 + generator.randrange(prices) * 0.5, 1.0, generator.choice(live)])
+    return snapshot, messages
+
+
+def run(side_class, snapshot, messages):
+    side = side_class([list(order) for order in snapshot])
+    deltas = [list(message) for message in messages]
+    start = time.perf_counter()
+    for delta in deltas:
+        side.storeArray(delta)
+    return time.perf_counter() - start, side
+
+
+def main():
+    orders_per_price = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    prices = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    snapshot, messages = l3_stream(orders_per_price, prices)
+    print(len(snapshot), 'orders,', orders_per_price, 'per price,', len(messages), 'deltas')
+    results = []
+    for name, side_class in [('linear scan', ScanningIndexedAsks), ('order handles', IndexedAsks)]:
+        elapsed, side = run(side_class, snapshot, messages)
+        results.append([level[2] for level in side])
+        print('{:>14} {:8.3f} s {:8.2f} us/delta'.format(name, elapsed, elapsed / len(messages) * 1e6))
+    assert results[0] == results[1], 'the sides differ'
+
+
+main()
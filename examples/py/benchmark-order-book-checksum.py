@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+# compares the per-message checksum loops of the exchange handlers with OrderBookChecksum
+#
+#     python examples/py/benchmark-order-book-checksum.py [okx|kraken] [recorded.jsonl]
+#
+# a recorded stream is a file with one raw ws message per line, okx 'books' messages
+# ({'data': [{'bids': ..., 'asks': ...}]}) and kraken v1 book messages are understood,
+# without a file a seeded random walk of okx-like string deltas is used
+
+import json
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.decimal_to_precision import number_to_string  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook  # noqa: E402
+from ccxt.async_support.base.ws.order_book_checksum import OrderBookChecksum, checksum_formats  # noqa: E402
+
+
+def load_recorded(path):
+    messages = []
+    with open(path) as file:
+        for line in file:
+            message = json.loads(line)
+            if isinstance(message, list):
+                # kraken v1: [channelID, {'a': [[price, volume, timestamp]...]}, {'b': ...}, 'book-10', pair]
+                bids = []
+                asks = []
+                for part in message[1:-2]:
+                    asks += part.get('as', part.get('a', []))
+                    bids += part.get('bs', part.get('b', []))
+                messages.append((bids, asks))
+            else:
+                for update in message.get('data', [message]):
+                    messages.append((update.get('bids', []), update.get('asks', [])))
+    return messages
+
+
+def random_walk(count=20000, seed=42):
+    generator = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        bids = []
+        asks = []
+        for _ in range(generator.randint(1, 10)):
+            distance = generator.randint(1, 400)
+            size = '0' if generator.random() < 0.3 else str(round(generator.random() * 10, 8))
+            bids.append([str(round(30000 - distance * 0.1, 1)), size, '0', '1'])
+            asks.append([str(round(30000 + distance * 0.1, 1)), size, '0', '1'])
+        messages.append((bids, asks))
+    return messages
+
+
+def okx_loop(orderbook):
+    # pro/okx.py handle_order_book_message
+    storedBids = orderbook['bids']
+    storedAsks = orderbook['asks']
+    payloadArray = []
+    for i in range(0, 25):
+        if i < len(storedBids):
+            payloadArray.append(number_to_string(storedBids[i][0]))
+            payloadArray.append(number_to_string(storedBids[i][1]))
+        if i < len(storedAsks):
+            payloadArray.append(number_to_string(storedAsks[i][0]))
+            payloadArray.append(number_to_string(storedAsks[i][1]))
+    return Exchange.crc32(':'.join(payloadArray), True)
+
+
+def kraken_loop(orderbook):
+    # pro/kraken.py handle_order_book, with format_number applied to number_to_string
+    def format_number(value):
+        return number_to_string(value).replace('.', '').lstrip('0')
+    payloadArray = []
+    for side in ['asks', 'bids']:
+        for level in orderbook[side][0:10]:
+            payloadArray.append(format_number(level[0]) + format_number(level[1]))
+    return Exchange.crc32(''.join(payloadArray), False)
+
+
+def run(messages, compute):
+    orderbook = OrderBook()
+    bids = orderbook['bids']
+    asks = orderbook['asks']
+    checksums = []
+    elapsed = 0
+    for message_bids, message_asks in messages:
+        for bid in message_bids:
+            bids.store(float(bid[0]), float(bid[1]))
+        for ask in message_asks:
+            asks.store(float(ask[0]), float(ask[1]))
+        start = time.perf_counter()
+        checksums.append(compute(orderbook))
+        elapsed += time.perf_counter() - start
+    return elapsed, checksums
+
+
+def main():
+    name = sys.argv[1] if len(sys.argv) > 1 else 'okx'
+    messages = load_recorded(sys.argv[2]) if len(sys.argv) > 2 else random_walk()
+    loop = okx_loop if name == 'okx' else kraken_loop
+    print(name, len(messages), 'messages')
+    loop_elapsed, expected = run(messages, loop)
+    engine_elapsed, actual = run(messages, OrderBookChecksum(checksum_formats[name]))
+    assert expected == actual, 'checksums differ'
+    for label, elapsed in [('handler loop', loop_elapsed), ('OrderBookChecksum', engine_elapsed)]:
+        print('{:>18} {:8.3f} s {:8.2f} us/message'.format(label, elapsed, elapsed / len(messages) * 1e6))
+
+
+main()
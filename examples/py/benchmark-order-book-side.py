@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# compares the list-backed and the tree-backed order book sides on a stream of deltas
+#
+#     python examples/py/benchmark-order-book-side.py [recorded.jsonl] [depth]
+#
+# a recorded stream is a file with one raw ws message per line, binance depthUpdate ('b', 'a')
+# and okx/bybit style ('bids', 'asks', optionally nested inside 'data') messages are understood,
+# without a file a seeded random walk around a mid price with 5000 levels per side is used
+
+import json
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.async_support.base.ws.order_book import OrderBook, TreeOrderBook  # noqa: E402
+
+
+def load_recorded(path):
+    messages = []
+    with open(path) as file:
+        for line in file:
+            message = json.loads(line)
+            data = message.get('data', message)
+            for update in (data if isinstance(data, list) else [data]):
+                bids = update.get('b', update.get('bids', []))
+                asks = update.get('a', update.get('asks', []))
+                messages.append((
+                    [[float(bid[0]), float(bid[1])] for bid in bids],
+                    [[float(ask[0]), float(ask[1])] for ask in asks],
+                ))
+    return messages
+
+
+def random_walk(count=20000, levels=5000, seed=42):
+    generator = random.Random(seed)
+    mid = 30000.0
+    messages = []
+    for _ in range(count):
+        mid += generator.choice([-0.5, 0, 0.5])
+        bids = []
+        asks = []
+        for _ in range(generator.randint(1, 20)):
+            distance = generator.randint(1, levels)
+            size = 0.0 if generator.random() < 0.3 else round(generator.random() * 10, 4)
+            bids.append([mid - distance * 0.5, size])
+            asks.append([mid + distance * 0.5, size])
+        messages.append((bids, asks))
+    return messages
+
+
+def run(book_class, messages, depth):
+    book = book_class({}, depth)
+    bids = book['bids']
+    asks = book['asks']
+    start = time.perf_counter()
+    for message_bids, message_asks in messages:
+        for bid in message_bids:
+            bids.store(bid[0], bid[1])
+        for ask in message_asks:
+            asks.store(ask[0], ask[1])
+        # what a consumer of watch_order_book touches on every update
+        book.limit()
+        bids[:10]
+        asks[:10]
+    return time.perf_counter() - start, len(bids) + len(asks)
+
+
+def main():
+    messages = load_recorded(sys.argv[1]) if len(sys.argv) > 1 else random_walk()
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    deltas = sum(len(bids) + len(asks) for bids, asks in messages)
+    print(len(messages), 'messages,', deltas, 'deltas, depth', depth)
+    for name, book_class in [('list', OrderBook), ('tree', TreeOrderBook)]:
+        elapsed, levels = run(book_class, messages, depth)
+        print('{:>5} {:8.3f} s {:10.0f} deltas/s {:6d} levels'.format(name, elapsed, deltas / elapsed, levels))
+
+
+main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# counts the event loop wakeups and the cpu time of many throttlers that wait for tokens
+#
+#     python examples/py/benchmark-throttler.py [throttlers] [seconds] [rateLimit in ms]
+#
+# every throttler has a consumer that calls it in a loop, like a bot polling one exchange
+# the previous looper, which polled the tokens every config['delay'], is kept below for comparison
+
+import asyncio
+import collections
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.async_support.base.throttler import Throttler  # noqa: E402
+
+
+class PollingThrottler(Throttler):
+    wakeups = 0
+
+    def __init__(self, config):
+        super(PollingThrottler, self).__init__(config)
+        self.queue = collections.deque()
+
+    async def looper(self):
+        last_timestamp = time.time() * 1000
+        while self.running:
+            future, cost = self.queue[0]
+            cost = self.config['cost'] if cost is None else cost
+            if self.config['tokens'] >= 0:
+                self.config['tokens'] -= cost
+                if not future.done():
+                    future.set_result(None)
+                self.queue.popleft()
+                await asyncio.sleep(0)
+                if len(self.queue) == 0:
+                    self.running = False
+            else:
+                await asyncio.sleep(self.config['delay'])
+                self.wakeups += 1
+                now = time.time() * 1000
+                elapsed = now - last_timestamp
+                last_timestamp = now
+                self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
+
+    def __call__(self, cost=None):
+        future = asyncio.Future()
+        self.queue.append((future, cost))
+        if not self.running:
+            self.running = True
+            asyncio.ensure_future(self.looper())
+        return future
+
+
+class CountingThrottler(Throttler):
+    wakeups = 0
+
+    def drain(self):
+        self.wakeups += 1
+        return super(CountingThrottler, self).drain()
+
+
+async def consume(throttler, deadline, calls):
+    while time.perf_counter() < deadline:
+        await throttler()
+        calls[0] += 1
+
+
+async def run(throttler_class, count, seconds, rate_limit):
+    throttlers = [throttler_class({'refillRate': 1 / rate_limit, 'capacity': 1}) for _ in range(count)]
+    calls = [0]
+    deadline = time.perf_counter() + seconds
+    cpu = time.process_time()
+    await asyncio.gather(*[consume(throttler, deadline, calls) for throttler in throttlers])
+    cpu = time.process_time() - cpu
+    return cpu, sum(throttler.wakeups for throttler in throttlers), calls[0]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3
+    rate_limit = float(sys.argv[3]) if len(sys.argv) > 3 else 400
+    print(count, 'throttlers,', seconds, 's, one call every', rate_limit, 'ms')
+    for name, throttler_class in [('polling', PollingThrottler), ('deadline', CountingThrottler)]:
+        cpu, wakeups, calls = asyncio.run(run(throttler_class, count, seconds, rate_limit))
+        print('{:>9} {:7.3f} s cpu {:9d} wakeups {:6d} calls'.format(name, cpu, wakeups, calls))
+
+
+main()
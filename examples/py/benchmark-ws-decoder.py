@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+# measures the ws messages per second of the json decoders of options['ws']['decoder']
+#
+#     python examples/py/benchmark-ws-decoder.py [binance|okx|htx] [recorded.jsonl]
+#
+# a recorded stream is a file with one raw ws message per line, htx lines are gzipped
+# before the run like the frames htx sends, without a file seeded random depth messages are used
+# the previous path, which decoded the bytes to str before parsing, is kept below for comparison
+# the typed row decodes binance depthUpdate and okx books into structs with the schemas below, with msgspec
+
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from aiohttp import WSMsgType  # noqa: E402
+
+from ccxt.async_support.base.ws.client import Client  # noqa: E402
+from ccxt.async_support.base.ws.decoders import json_decoders, typed_decoders  # noqa: E402
+from ccxt.async_support.base.ws.functions import is_json_encoded_object  # noqa: E402
+from ccxt.base.errors import NotSupported  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class Message:
+    def __init__(self, type, data):
+        self.type = type
+        self.data = data
+
+
+class LegacyClient(Client):
+    def handle_text_or_binary_message(self, data):
+        if isinstance(data, bytes):
+            data = data.decode()
+        if is_json_encoded_object(data):
+            if orjson is None:
+                decode = json.loads(data)
+            else:
+                decode = orjson.loads(data)
+        else:
+            decode = data
+        self.on_message_callback(self, decode)
+
+
+def levels(generator, price, count):
+    return [[str(round(price + generator.randint(-500, 500) / 100, 2)), str(generator.randint(0, 20000) / 1000)] for _ in range(count)]
+
+
+# the schemas that options['ws']['schemas'] would add for these channels
+schemas = {
+    'binance': {
+        'match': '"e":"depthUpdate"',
+        'fields': {'e': 'str', 'E': 'int', 's': 'str', 'U': 'int', 'u': 'int', 'pu': 'int?', 'b': 'levels', 'a': 'levels'},
+    },
+    'okx': {
+        'match': '"channel":"books',
+        'fields': {'arg': {'channel': 'str', 'instId': 'str'}, 'action': 'str', 'data': [{'asks': 'levels', 'bids': 'levels', 'ts': 'str', 'checksum': 'int', 'seqId': 'int', 'prevSeqId': 'int?'}]},
+    },
+}
+
+
+def generate(feed, count):
+    generator = random.Random(1)
+    messages = []
+    for i in range(count):
+        if feed == 'binance':
+            message = {'e': 'depthUpdate', 'E': 1700000000000 + i, 's': 'BTCUSDT', 'U': i * 10, 'u': i * 10 + 9, 'b': levels(generator, 30000, 8), 'a': levels(generator, 30010, 8)}
+        elif feed == 'okx':
+            message = {'arg': {'channel': 'books', 'instId': 'BTC-USDT'}, 'action': 'update', 'data': [{'asks': [level + ['0', '3'] for level in levels(generator, 30010, 10)], 'bids': [level + ['0', '2'] for level in levels(generator, 30000, 10)], 'ts': str(1700000000000 + i), 'checksum': generator.randint(-2 ** 31, 2 ** 31), 'seqId': i}]}
+        else:
+            message = {'ch': 'market.btcusdt.mbp.150', 'ts': 1700000000000 + i, 'tick': {'seqNum': i, 'prevSeqNum': i - 1, 'bids': [[float(price), float(size)] for price, size in levels(generator, 30000, 10)], 'asks': [[float(price), float(size)] for price, size in levels(generator, 30010, 10)]}}
+        messages.append(json.dumps(message))
+    return messages
+
+
+def frames(feed, messages):
+    if feed == 'htx':
+        return [Message(WSMsgType.BINARY, gzip.compress(message.encode())) for message in messages]
+    return [Message(WSMsgType.TEXT if feed == 'okx' else WSMsgType.BINARY, message if feed == 'okx' else message.encode()) for message in messages]
+
+
+def measure(client, messages, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            client.handle_message(message)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(messages) / best
+
+
+def main():
+    feeds = [sys.argv[1]] if len(sys.argv) > 1 else ['binance', 'okx', 'htx']
+    for feed in feeds:
+        if len(sys.argv) > 2:
+            with open(sys.argv[2]) as file:
+                messages = [line.strip() for line in file if line.strip()]
+        else:
+            messages = generate(feed, 20000)
+        messages = frames(feed, messages)
+        print(feed, len(messages), 'messages')
+        clients = [('legacy', LegacyClient('wss://example.com', lambda client, message: None, None, None, None, {'gunzip': feed == 'htx'}))]
+        for name in json_decoders:
+            try:
+                clients.append((name, Client('wss://example.com', lambda client, message: None, None, None, None, {'gunzip': feed == 'htx', 'decoder': name})))
+            except NotSupported:
+                print('{:>10} not installed'.format(name))
+        typed = typed_decoders({feed: (schemas[feed], lambda client, message: None)}) if feed in schemas else None
+        if typed:
+            clients.append(('typed', Client('wss://example.com', lambda client, message: None, None, None, None, {'typed_channels': typed})))
+        for name, client in clients:
+            print('{:>10} {:10.0f} messages/s'.format(name, measure(client, messages)))
+
+
+main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# compares the cpu time of the decompression of gzip and deflate ws frames
+#
+#     python examples/py/benchmark-ws-decompress.py [frames]
+#
+# the frames are seeded random depth messages like the ones of htx (gzip) and okcoin (deflate)
+# the previous gunzip, which read a GzipFile and decoded the result to str, is kept below for comparison
+
+import gzip
+import io
+import json
+import os
+import random
+import sys
+import time
+import zlib
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from aiohttp import WSMsgType  # noqa: E402
+
+from ccxt.async_support.base.ws.client import Client  # noqa: E402
+from ccxt.async_support.base.ws.functions import gunzip_bytes, inflate  # noqa: E402
+
+
+class Message:
+    def __init__(self, type, data):
+        self.type = type
+        self.data = data
+
+
+def legacy_gunzip(data):
+    return gzip.GzipFile('', 'rb', 9, io.BytesIO(data)).read().decode('utf-8')
+
+
+class LegacyClient(Client):
+    def handle_message(self, message):
+        self.handle_text_or_binary_message(legacy_gunzip(message.data))
+
+
+def generate(count):
+    generator = random.Random(1)
+    messages = []
+    for i in range(count):
+        message = {'ch': 'market.btcusdt.mbp.150', 'ts': 1700000000000 + i, 'tick': {'seqNum': i, 'bids': [[round(30000 - generator.random() * 50, 2), round(generator.random() * 5, 4)] for _ in range(20)], 'asks': [[round(30000 + generator.random() * 50, 2), round(generator.random() * 5, 4)] for _ in range(20)]}}
+        messages.append(json.dumps(message).encode())
+    return messages
+
+
+def deflate(data):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def measure(function, frames, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        for frame in frames:
+            function(frame)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(frames) * 1000000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    messages = generate(count)
+    gzipped = [gzip.compress(message) for message in messages]
+    deflated = [deflate(message) for message in messages]
+    print(count, 'frames,', sum(map(len, messages)) // count, 'bytes per message')
+    rows = [
+        ('gunzip GzipFile + str', legacy_gunzip, gzipped),
+        ('gunzip zlib bytes', gunzip_bytes, gzipped),
+        ('inflate', inflate, deflated),
+    ]
+    for name, function, frames in rows:
+        print('{:>24} {:8.2f} us cpu per frame'.format(name, measure(function, frames)))
+    # the whole path of a frame, decompression and json decoding
+    legacy = LegacyClient('wss://example.com', lambda client, message: None, None, None, None, {})
+    client = Client('wss://example.com', lambda client, message: None, None, None, None, {'gunzip': True})
+    frames = [Message(WSMsgType.BINARY, frame) for frame in gzipped]
+    for name, client in [('client legacy', legacy), ('client', client)]:
+        print('{:>24} {:8.2f} us cpu per frame'.format(name, measure(client.handle_message, frames)))
+
+
+main()
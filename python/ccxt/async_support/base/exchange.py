@@ -20,23 +20,26 @@ from ccxt.base.types import Int, Str, Num, Strings
 
 # -----------------------------------------------------------------------------
 
-from ccxt.async_support.base.throttler import Throttler
+from ccxt.async_support.base.throttler import Throttler, rate_limit_headers
+from ccxt.async_support.base.ws.client import Client
 
 # -----------------------------------------------------------------------------
 
 from ccxt.base.errors import BaseError, BadSymbol, BadRequest, BadResponse, ExchangeError, ExchangeNotAvailable, RequestTimeout, NotSupported, NullResponse, InvalidAddress, RateLimitExceeded, OperationFailed
-from ccxt.base.types import ConstructorArgs, OrderType, OrderSide, OrderRequest, CancellationRequest
+from ccxt.base.types import ConstructorArgs, OrderType, OrderSide, OrderRequest, CancellationRequest, rate_limit_priority
 
 # -----------------------------------------------------------------------------
 
 from ccxt.base.exchange import Exchange as BaseExchange, ArgumentsRequired
+from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE
 
 # -----------------------------------------------------------------------------
 
 from ccxt.async_support.base.ws.functions import inflate, inflate64, gunzip
-from ccxt.async_support.base.ws.client import Client
+from ccxt.async_support.base.ws.decoders import ws_schemas, typed_decoders
 from ccxt.async_support.base.ws.future import Future
-from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook
+from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook, TreeOrderBook, TreeCountedOrderBook
+from ccxt.async_support.base.ws.order_book_checksum import OrderBookChecksum, checksum_formats
 
 
 # -----------------------------------------------------------------------------
@@ -56,6 +59,21 @@ __all__ = [
 # -----------------------------------------------------------------------------
 
 
+class OrderBooks(dict):
+    # configures the per-market settings of an order book when it is stored under its symbol
+
+    def __init__(self, exchange, orderbooks={}):
+        super(OrderBooks, self).__init__(orderbooks)
+        self.exchange = exchange
+
+    def __setitem__(self, symbol, orderbook):
+        if isinstance(orderbook, OrderBook):
+            self.exchange.configure_order_book_market(orderbook, symbol)
+        super(OrderBooks, self).__setitem__(symbol, orderbook)
+
+# -----------------------------------------------------------------------------
+
+
 class Exchange(BaseExchange):
     synchronous = False
     streaming = {
@@ -76,8 +94,13 @@ class Exchange(BaseExchange):
         self.cafile = config.get('cafile', certifi.where())
         self.throttler = None
         super(Exchange, self).__init__(config)
+        self.orderbooks = OrderBooks(self, self.orderbooks)
         self.markets_loading = None
         self.reloading_markets = False
+        # an unknown headers format fails here instead of in fetch() after a response came in
+        spec = self.safe_value(self.options, 'rateLimitHeaders')
+        if spec and self.rate_limit_headers_specs(spec) is None:
+            raise NotSupported(self.id + ' does not support the ' + str(spec) + ' options["rateLimitHeaders"] format, use one of ' + ', '.join(rate_limit_headers) + ', a dict or a list of dicts')
 
     def get_event_loop(self):
         return self.asyncio_loop
@@ -86,7 +109,13 @@ class Exchange(BaseExchange):
         self.throttler = Throttler(self.tokenBucket, self.asyncio_loop)
 
     async def throttle(self, cost=None):
-        return await self.throttler(cost)
+        # the lane is set by the endpoint that is being called, see Entry
+        return await self.throttler(cost, rate_limit_priority.get())
+
+    async def fetch_many(self, method, args_list):
+        # calls method with every list of arguments concurrently and returns the results in the same order
+        method = getattr(self, method)
+        return await asyncio.gather(*[method(*args) for args in args_list])
 
     def get_session(self):
         return self.session
@@ -121,9 +150,62 @@ class Exchange(BaseExchange):
 
         if self.own_session and self.session is None:
             # Pass this SSL context to aiohttp and create a TCPConnector
-            self.tcp_connector = aiohttp.TCPConnector(ssl=self.ssl_context, loop=self.asyncio_loop, enable_cleanup_closed=True)
+            self.tcp_connector = aiohttp.TCPConnector(ssl=self.ssl_context, loop=self.asyncio_loop, enable_cleanup_closed=True, **self.tcp_connector_options())
             self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=self.tcp_connector, trust_env=self.aiohttp_trust_env)
 
+    def tcp_connector_options(self):
+        # options['http'] tunes the TCPConnector, only the keys that are set are passed to aiohttp
+        #
+        #     limit              the connections open at once, 100 by default
+        #     limitPerHost       the connections open at once per host, unlimited by default
+        #     ttlDnsCache        seconds the resolved addresses are cached, 10 by default, None caches forever
+        #     keepaliveTimeout   seconds an idle connection is kept open, 15 by default
+        #     happyEyeballsDelay seconds before the next address is tried in parallel, aiohttp 3.10+
+        #
+        config = self.safe_dict(self.options, 'http', {})
+        keys = {
+            'limit': 'limit',
+            'limitPerHost': 'limit_per_host',
+            'ttlDnsCache': 'ttl_dns_cache',
+            'keepaliveTimeout': 'keepalive_timeout',
+            'happyEyeballsDelay': 'happy_eyeballs_delay',
+        }
+        return {keys[key]: value for key, value in config.items() if key in keys}
+
+    def rest_hosts(self, urls=None):
+        # the scheme and host of every rest url in urls['api']
+        if urls is None:
+            urls = self.safe_value(self.urls, 'api', {})
+        if isinstance(urls, str):
+            url = yarl.URL(self.implode_hostname(urls))
+            return [str(url.origin())] if url.scheme in ('http', 'https') and url.host else []
+        values = urls.values() if isinstance(urls, dict) else urls if isinstance(urls, list) else []
+        hosts = []
+        for value in values:
+            for host in self.rest_hosts(value):
+                if host not in hosts:
+                    hosts.append(host)
+        return hosts
+
+    async def warmup(self, connections=1):
+        # opens connections to the rest hosts ahead of the first request, so it does not wait for dns and tls
+        # connections per host are opened in parallel and stay in the pool for keepaliveTimeout
+        # returns the hosts that answered, proxies are not used
+        self.open()
+        hosts = self.rest_hosts()
+        timeout = aiohttp.ClientTimeout(total=self.timeout / 1000)
+
+        async def connect(host):
+            try:
+                async with self.session.head(host + '/', allow_redirects=False, timeout=timeout) as response:
+                    await response.read()
+                return True
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+                return False
+
+        results = await asyncio.gather(*[connect(host) for host in hosts for _ in range(connections)])
+        return [host for i, host in enumerate(hosts) if any(results[i * connections:(i + 1) * connections])]
+
     async def close(self):
         await self.ws_close()
         if self.session is not None:
@@ -221,6 +303,9 @@ class Exchange(BaseExchange):
                         headers[header] = raw_headers[header]
                 http_status_code = response.status
                 http_status_text = response.reason
+                usage = self.handle_rate_limit_headers(url, headers)
+                if usage is not None:
+                    await usage
                 http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_response, request_headers, request_body)
                 json_response = self.parse_json(http_response)
                 if self.enableLastHttpResponse:
@@ -259,6 +344,57 @@ class Exchange(BaseExchange):
             return http_response
         return response.content
 
+    def rate_limit_headers_specs(self, spec):
+        # the list of specs of options['rateLimitHeaders'] or None for an unknown format
+        # True is the format of the exchange or of the exchange it derives from, like binance for binanceusdm
+        if isinstance(spec, (dict, list)):
+            return spec if isinstance(spec, list) else [spec]
+        if spec is True:
+            names = [cls.__name__ for cls in type(self).__mro__]
+            name = next((name for name in [self.id] + names if name in rate_limit_headers), None)
+        else:
+            name = spec if spec in rate_limit_headers else None
+        if name is None:
+            return None
+        spec = rate_limit_headers[name]
+        return spec if isinstance(spec, list) else [spec]
+
+    def handle_rate_limit_headers(self, url, headers):
+        # options['rateLimitHeaders'] is True for the format of the exchange, a format name, a custom dict or a list of them
+        # the usage the exchange reports slows the throttler down to what is left of the window
+        # returns the future of the update of a shared backend or None
+        spec = self.safe_value(self.options, 'rateLimitHeaders')
+        if not spec or self.throttler is None:
+            return None
+        specs = self.rate_limit_headers_specs(spec)
+        if specs is None:
+            # the format is checked in the constructor, a response is not failed for it
+            return None
+        spec = next((spec for spec in specs if any(part in url for part in spec.get('urls', ['']))), None)
+        if spec is None:
+            # an api without a spec reports against a limit the bucket does not know
+            return None
+        values = {key.lower(): value for key, value in headers.items()}
+        limit = spec.get('limit')
+        if isinstance(limit, str):
+            limit = self.safe_number(values, limit)
+        if 'remaining' in spec:
+            remaining = self.safe_number(values, spec['remaining'])
+        else:
+            used = self.safe_number(values, spec['used'])
+            remaining = None if (used is None or limit is None) else limit - used
+        if 'reset' in spec:
+            reset = self.safe_number(values, spec['reset'])
+        elif 'resetTimestamp' in spec:
+            timestamp = self.safe_number(values, spec['resetTimestamp'])
+            reset = None if timestamp is None else timestamp - self.milliseconds()
+        else:
+            reset = spec['window'] - self.milliseconds() % spec['window']
+        if remaining is None or reset is None:
+            return None
+        cost = spec.get('cost', 1)
+        return self.throttler.update_usage(remaining * cost, max(reset, 0), 'default', spec.get('margin', 0.9), spec.get('exhaustedOnly', False))
+
     def get_socks_proxy_session(self, socksProxy):
         if (self.socks_proxy_sessions is None):
             self.socks_proxy_sessions = {}
@@ -392,18 +528,105 @@ class Exchange(BaseExchange):
     def gunzip(data):
         return gunzip(data)
 
+    def order_book_engine(self):
+        # 'list' (default) or 'tree', see ccxt/async_support/base/ws/order_book_side.py
+        ws_options = self.safe_dict(self.options, 'ws', {})
+        return self.safe_string(ws_options, 'orderBookEngine', 'list')
+
+    def configure_order_book(self, orderbook):
+        ws_options = self.safe_dict(self.options, 'ws', {})
+        if self.safe_bool(ws_options, 'orderBookDepthView', False):
+            # the levels past the depth come back when the top is removed, they are only right if the feed
+            # deletes every level it drops, unlike the feeds that are truncated on the client, like kraken book-N
+            if not self.safe_bool(ws_options, 'orderBookDeletes', False):
+                raise NotSupported(self.id + ' options["ws"]["orderBookDepthView"] requires an order book feed that deletes every level it drops, see options["ws"]["orderBookDeletes"]')
+            orderbook.set_depth_view()
+        if self.safe_bool(ws_options, 'orderBookWireStrings', False):
+            orderbook.set_wire_strings()
+        return orderbook
+
+    def configure_order_book_market(self, orderbook, symbol):
+        # options['ws']['orderBookTickSize'] keys the levels by integer numbers of price ticks
+        ws_options = self.safe_dict(self.options, 'ws', {})
+        if self.safe_bool(ws_options, 'orderBookTickSize', False):
+            tick = self.order_book_tick_size(symbol)
+            if tick != orderbook['bids'].tick:
+                orderbook.set_tick_size(tick)
+        return orderbook
+
+    def order_book_tick_size(self, symbol):
+        # None if the market is unknown or its price precision is not a fixed tick
+        market = self.safe_dict(self.markets, symbol, {})
+        precision = self.safe_dict(market, 'precision', {})
+        if self.precisionMode == TICK_SIZE:
+            return self.safe_float(precision, 'price')
+        if self.precisionMode == DECIMAL_PLACES:
+            digits = self.safe_integer(precision, 'price')
+            if digits is not None:
+                return float(self.parse_precision(str(digits)))
+        return None
+
     def order_book(self, snapshot={}, depth=None):
-        return OrderBook(snapshot, depth)
+        if self.order_book_engine() == 'tree':
+            return self.configure_order_book(TreeOrderBook(snapshot, depth))
+        return self.configure_order_book(OrderBook(snapshot, depth))
 
     def indexed_order_book(self, snapshot={}, depth=None):
-        return IndexedOrderBook(snapshot, depth)
+        return self.configure_order_book(IndexedOrderBook(snapshot, depth))
 
     def counted_order_book(self, snapshot={}, depth=None):
-        return CountedOrderBook(snapshot, depth)
-
-    def client(self, url):
+        if self.order_book_engine() == 'tree':
+            return self.configure_order_book(TreeCountedOrderBook(snapshot, depth))
+        return self.configure_order_book(CountedOrderBook(snapshot, depth))
+
+    def handle_deltas_with_keys(self, bookSide, deltas, priceKey=0, amountKey=1, countOrIdKey=2):
+        # one store_many() call per message instead of one storeArray() call per level
+        if bookSide.strings:
+            # the side parses the wire strings itself and keeps them
+            prices = [self.safe_string(delta, priceKey) for delta in deltas]
+            sizes = [self.safe_string(delta, amountKey) for delta in deltas]
+        else:
+            prices = [self.safe_number(delta, priceKey) for delta in deltas]
+            sizes = [self.safe_number(delta, amountKey) for delta in deltas]
+        countsOrIds = [self.safe_integer(delta, countOrIdKey) for delta in deltas]
+        if None not in countsOrIds:
+            bookSide.store_many(prices, sizes, countsOrIds)
+        elif all(countOrId is None for countOrId in countsOrIds):
+            bookSide.store_many(prices, sizes)
+        else:
+            for price, size, countOrId in zip(prices, sizes, countsOrIds):
+                bookSide.storeArray([price, size] if countOrId is None else [price, size, countOrId])
+
+    def order_book_checksum(self, orderbook, spec=None):
+        # spec is the name of a format from checksum_formats or a dict with a custom format
+        # it defaults to options['ws']['checksumFormat'] and then to the format of the exchange id
+        # the generated handlers of the exchanges still build their payloads themselves and do not call it yet
+        if orderbook.checksum is None:
+            if spec is None:
+                ws_options = self.safe_dict(self.options, 'ws', {})
+                spec = self.safe_value(ws_options, 'checksumFormat', self.id)
+            if not isinstance(spec, dict):
+                if spec not in checksum_formats:
+                    raise NotSupported(self.id + ' order_book_checksum() does not support the ' + str(spec) + ' checksum format')
+                spec = checksum_formats[spec]
+            decimals = None
+            if spec.get('decimals') == 'market':
+                # kraken builds the payload from its fixed-precision strings, 0.05000 is 5000 and not 5
+                market = self.market(orderbook['symbol'])
+                decimals = (self.precision_decimals(market['precision']['price']), self.precision_decimals(market['precision']['amount']))
+            orderbook.checksum = OrderBookChecksum(spec, decimals)
+        return orderbook.checksum(orderbook)
+
+    def precision_decimals(self, precision):
+        if self.precisionMode == TICK_SIZE:
+            return int(self.precision_from_string(self.number_to_string(precision)))
+        return int(precision)
+
+    def client(self, url, key=None):
+        # key is the key of the client in self.clients, the url by default, see pooled_client()
+        key = url if key is None else key
         self.clients = self.clients or {}
-        if url not in self.clients:
+        if key not in self.clients:
             on_message = self.handle_message
             on_error = self.on_error
             on_close = self.on_close
@@ -414,17 +637,102 @@ class Exchange(BaseExchange):
                 'log': getattr(self, 'log'),
                 'ping': getattr(self, 'ping', None),
                 'verbose': self.verbose,
-                'throttle': Throttler(self.tokenBucket, self.asyncio_loop),
+                # the messages of a connection are paced on their own, not from the budget shared through a backend
+                'throttle': Throttler(self.omit(self.tokenBucket, ['backend', 'key']), self.asyncio_loop),
                 'asyncio_loop': self.asyncio_loop,
+                'key': key,
             }, ws_options)
+            typed_channels = self.typed_channels()
+            if typed_channels:
+                options['typed_channels'] = typed_channels
             # we use aiohttp instead of fastClient now because of this
             # https://github.com/ccxt/ccxt/pull/25995
-            self.clients[url] = Client(url, on_message, on_error, on_close, on_connected, options)
+            self.clients[key] = Client(url, on_message, on_error, on_close, on_connected, options)
             # set http/s proxy (socks proxy should be set in other place)
             httpProxy, httpsProxy, socksProxy = self.check_ws_proxy_settings()
             if (httpProxy or httpsProxy):
-                self.clients[url].proxy = httpProxy if httpProxy else httpsProxy
-        return self.clients[url]
+                self.clients[key].proxy = httpProxy if httpProxy else httpsProxy
+        return self.clients[key]
+
+    def connection_pool(self, url):
+        # options['ws']['connectionPool'] packs the subscriptions to a url onto several connections, True or
+        #
+        #     maxSubscriptions  the subscriptions per connection, options['ws']['maxSubscriptionsPerConnection'] or 200 by default
+        #     maxConnections    the connections per url, 10 by default
+        #     urls              the urls that are pooled, all by default
+        #
+        # returns (maxSubscriptions, maxConnections) or None when url is not pooled
+        ws_options = self.safe_dict(self.options, 'ws', {})
+        config = self.safe_value(ws_options, 'connectionPool')
+        if not config:
+            return None
+        config = config if isinstance(config, dict) else {}
+        urls = self.safe_list(config, 'urls')
+        if urls is not None and url not in urls:
+            return None
+        limit = self.safe_integer(config, 'maxSubscriptions', self.safe_integer(ws_options, 'maxSubscriptionsPerConnection', 200))
+        return limit, self.safe_integer(config, 'maxConnections', 10)
+
+    def pooled_client(self, url, subscribe_hashes, subscription=None):
+        # the connection to url that has the subscriptions already, or the subscriptions that an unsubscription
+        # removes (subscription['subMessageHashes']), or the least used one with room for them
+        # a connection that closes leaves the pool, the watch calls that follow go to the least used connections
+        pool = self.connection_pool(url) if subscribe_hashes else None
+        if pool is None:
+            return self.client(url)
+        limit, connections = pool
+        first = (self.clients or {}).get(url)
+        if first is not None and ('authenticated' in first.futures or 'authenticated' in first.subscriptions):
+            # the login of the authenticate methods is sent through self.client(url), a url that authenticates is not spread
+            return first
+        hashes = list(subscribe_hashes)
+        if isinstance(subscription, dict):
+            hashes += self.safe_list(subscription, 'subMessageHashes', [])
+        clients = [client for client in (self.clients or {}).values() if client.url == url]
+        for client in clients:
+            if any(subscribe_hash in client.subscriptions for subscribe_hash in hashes):
+                return client
+        free = [client for client in clients if len(client.subscriptions) + len(subscribe_hashes) <= limit]
+        if free:
+            return min(free, key=lambda client: len(client.subscriptions))
+        if len(clients) >= connections:
+            raise ExchangeError(self.id + ' reached the limit of ' + str(connections) + ' connections with ' + str(limit) + ' subscriptions each to ' + url + ', increase options["ws"]["connectionPool"]')
+        # the first connection is the one of self.client(url)
+        key = url
+        index = 0
+        while key in (self.clients or {}):
+            index += 1
+            key = url + '#' + str(index)
+        return self.client(url, key)
+
+    def ws_connection_counts(self):
+        # the number of subscriptions of every connection, by url
+        counts = {}
+        for client in (self.clients or {}).values():
+            counts.setdefault(client.url, []).append(len(client.subscriptions))
+        return counts
+
+    def typed_channels(self):
+        # the channels of ws_schemas and options['ws']['schemas'] that options['ws']['typedChannels'] turns on
+        # and that have a handle_typed_<channel> method, like handle_typed_book_ticker(client, message), which gets the structs
+        # or the method named in the handler of the schema, which gets the fields as a dict like the usual messages
+        ws_options = self.safe_dict(self.options, 'ws', {})
+        enabled = self.safe_value(ws_options, 'typedChannels')
+        if not enabled:
+            return None
+        schemas = self.extend(self.safe_dict(ws_schemas, self.id, {}), self.safe_dict(ws_options, 'schemas', {}))
+        channels = {}
+        plain = set()
+        for name, schema in schemas.items():
+            if enabled is not True and name not in enabled:
+                continue
+            handler = getattr(self, 'handle_typed_' + self.un_camel_case(name), None)
+            if handler is None and 'handler' in schema:
+                handler = getattr(self, schema['handler'], None)
+                plain.add(name)
+            if handler is not None:
+                channels[name] = (schema, handler)
+        return typed_decoders(channels, plain) if channels else None
 
     def delay(self, timeout, method, *args):
         return self.asyncio_loop.call_later(timeout / 1000, self.spawn, method, *args)
@@ -439,7 +747,7 @@ class Exchange(BaseExchange):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
+        client = self.pooled_client(url, subscribe_hashes, subscription)
 
         future = Future.race([client.future(message_hash) for message_hash in message_hashes])
 
@@ -478,7 +786,7 @@ class Exchange(BaseExchange):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
+        client = self.pooled_client(url, None if subscribe_hash is None else [subscribe_hash], subscription)
         if subscribe_hash is None and message_hash in client.futures:
             return client.futures[message_hash]
         future = client.future(message_hash)
@@ -523,8 +831,8 @@ class Exchange(BaseExchange):
         pass
 
     def on_error(self, client, error):
-        if client.url in self.clients and self.clients[client.url].error:
-            del self.clients[client.url]
+        if client.key in self.clients and self.clients[client.key].error:
+            del self.clients[client.key]
 
     def on_close(self, client, error):
         if client.error:
@@ -532,8 +840,8 @@ class Exchange(BaseExchange):
             pass
         else:
             # server disconnected a working connection
-            if client.url in self.clients:
-                del self.clients[client.url]
+            if client.key in self.clients:
+                del self.clients[client.key]
 
     async def ws_close(self):
         if self.clients:
@@ -561,7 +869,7 @@ class Exchange(BaseExchange):
                     return
                 tries += 1
             client.reject(ExchangeError(self.id + ' nonce is behind cache after ' + str(maxRetries) + ' tries.'), messageHash)
-            del self.clients[client.url]
+            del self.clients[client.key]
         except BaseError as e:
             client.reject(e, messageHash)
             await self.load_order_book(client, messageHash, symbol, limit, params)
@@ -2,6 +2,85 @@ import asyncio
 import collections
 from time import time
 
+from ccxt.base.rate_limiter import bucket_defaults, limit, spend
+
+
+# lanes of the queue, lower numbers are released first from the same tokens
+priorities = {
+    'trading': 0,
+    'account': 1,
+    'market': 2,
+}
+
+# the tokenBucket itself is the 'default' bucket, more buckets can be configured in tokenBucket['buckets']
+#
+#     'tokenBucket': {
+#         'refillRate': 1 / 50,  # request weight
+#         'buckets': {
+#             'orders': {'refillRate': 10 / 10000, 'capacity': 10, 'tokens': 10},
+#         },
+#     }
+#
+# a cost is a number spent from the default bucket or a dict of costs per bucket, {'default': 1, 'orders': 1}
+# a call only waits for the buckets it spends from
+
+# the usage that exchanges report in the response headers, see Exchange.handle_rate_limit_headers()
+#
+#     used            the header with the units used in the current window
+#     remaining       the header with the units left in the current window, instead of used
+#     limit           the units per window, a number or a header
+#     window          the length of a fixed window in ms, aligned to the epoch
+#     reset           the header with the ms left until the window resets, instead of window
+#     resetTimestamp  the header with the timestamp of the reset, instead of window
+#     cost            tokens per unit of the exchange, from the cost comments in describe()
+#     margin          the share of the remaining units that is used, in-flight calls are not counted yet
+#     exhaustedOnly   the limit is per endpoint, only an exhausted window pauses the whole bucket
+#     urls            the parts of the urls the spec applies to, all urls by default
+#
+# an exchange with several apis that count against different limits has a list of specs,
+# the first spec that matches the url of a response is used and a response that matches none is ignored
+# the usage never raises the refill rate above the configured one, the apis share the bucket
+
+rate_limit_headers = {
+    'binance': [
+        {
+            # IP(api) 6000 weight per minute, 1 weight => cost = 0.2
+            'urls': ['/api/v', '/papi/'],
+            'used': 'x-mbx-used-weight-1m',
+            'limit': 6000,
+            'window': 60000,
+            'cost': 0.2,
+        },
+        {
+            # IP(sapi) 12000 weight per minute, 1 weight => cost = 0.1
+            'urls': ['/sapi/'],
+            'used': 'x-sapi-used-ip-weight-1m',
+            'limit': 12000,
+            'window': 60000,
+            'cost': 0.1,
+        },
+        {
+            # 2400 weight per minute, 1 weight => cost = 1
+            'urls': ['/fapi/', '/dapi/'],
+            'used': 'x-mbx-used-weight-1m',
+            'limit': 2400,
+            'window': 60000,
+            'cost': 1,
+        },
+    ],
+    'bybit': {
+        'remaining': 'x-bapi-limit-status',
+        'resetTimestamp': 'x-bapi-limit-reset-timestamp',
+        'exhaustedOnly': True,
+    },
+    'kucoin': {
+        'remaining': 'gw-ratelimit-remaining',
+        'reset': 'gw-ratelimit-reset',
+        'cost': 1,
+    },
+}
+
+
 
 class Throttler:
     def __init__(self, config, loop=None):
@@ -12,39 +91,232 @@ class Throttler:
             'cost': 1.0,
             'tokens': 0,
             'maxCapacity': 2000,
+            'backpressure': False,  # calls over maxCapacity wait for room in the queue instead of raising
             'capacity': 1.0,
+            'priority': 'account',  # the lane of the calls that do not choose one
+            'backend': None,  # a RateLimiterBackend from ccxt.base.rate_limiter that keeps the tokens instead
+            'key': 'default',  # the throttlers with the same backend and key share the buckets, an api key or an ip
         }
         self.config.update(config)
-        self.queue = collections.deque()
+        self.buckets = {
+            'default': self.config,
+        }
+        for name, bucket in self.config.get('buckets', {}).items():
+            self.buckets[name] = dict(bucket_defaults, **bucket)
+        self.lanes = {}  # priority number to a queue of (future, costs, timestamp)
+        self.length = 0
+        self.waiting = {}  # the lanes of the calls that wait for room in the queue with backpressure
+        self.waiting_length = 0
+        self.stats = {
+            'released': 0,
+            'waitTime': 0,  # ms from the call to the release, summed over the released calls
+            'maxWaitTime': 0,
+            'maxLength': 0,
+            'backpressured': 0,  # calls that waited for room in the queue
+        }
         self.running = False
+        self.timer = None  # the single wakeup scheduled while the tokens refill
+        self.blocked = set()  # the buckets the waiting calls are short of
+        self.state = {}  # the tokens and the time of the last refill of every bucket, see spend()
+
+    def get_loop(self):
+        # the loop of the exchange, asyncio_loop, or the current one
+        return self.loop if self.loop is not None else asyncio.get_event_loop()
+
+    def acquire(self, costs):
+        # spends the costs and returns {} or spends nothing and returns the ms every short bucket needs
+        if self.config['backend'] is not None:
+            return self.config['backend'].acquire(self.config['key'], costs, self.buckets)
+        return spend(self.state, costs, self.buckets, time() * 1000)
 
-    async def looper(self):
-        last_timestamp = time() * 1000
-        while self.running:
-            future, cost = self.queue[0]
-            cost = self.config['cost'] if cost is None else cost
-            if self.config['tokens'] >= 0:
-                self.config['tokens'] -= cost
-                if not future.done():
-                    future.set_result(None)
-                self.queue.popleft()
-                # context switch
-                await asyncio.sleep(0)
-                if len(self.queue) == 0:
-                    self.running = False
+    def update_usage(self, remaining, reset, name='default', margin=0.9, exhausted_only=False):
+        # remaining is the number of tokens the exchange still accepts and reset is the number of ms until it renews them
+        # returns the future of the update of the backend, which keeps the tokens instead of the bucket
+        bucket = self.buckets[name]
+        if 'configuredRefillRate' not in bucket:
+            bucket['configuredRefillRate'] = bucket['refillRate']
+        if remaining <= 0:
+            # nothing goes through until the window resets
+            bucket['refillRate'] = bucket['configuredRefillRate']
+            tokens = -reset * bucket['refillRate']
+            if self.config['backend'] is not None:
+                return self.get_loop().run_in_executor(None, self.config['backend'].limit, self.config['key'], name, tokens, self.buckets)
+            limit(self.state, name, tokens, self.buckets, time() * 1000)
+        elif not exhausted_only:
+            # spread what is left over the rest of the window, never faster than configured
+            bucket['refillRate'] = min(remaining * margin / max(reset, 1), bucket['configuredRefillRate'])
+        return None
+
+    def entries(self):
+        # the queued calls in the order they are released
+        for priority in sorted(self.lanes):
+            yield from self.lanes[priority]
+
+    def plan(self, entries):
+        # spends the tokens of the calls in order and returns the calls that got them,
+        # the ms the short buckets need and the buckets that a waiting call is short of
+        # later calls that spend from the short buckets wait in line, with a backend this runs in the executor
+        blocked = set()
+        granted = []
+        waits = []
+        for entry in entries:
+            if len(blocked) >= len(self.buckets):
+                break
+            future, costs, timestamp = entry
+            if future.done():
+                continue
+            short = [name for name in costs if name in blocked]
+            if not short:
+                wait = self.acquire(costs)
+                short = list(wait)
+                waits.extend(wait.values())
+            if short:
+                blocked.update(short)
             else:
-                await asyncio.sleep(self.config['delay'])
-                now = time() * 1000
-                elapsed = now - last_timestamp
-                last_timestamp = now
-                self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
-
-    def __call__(self, cost=None):
-        future = asyncio.Future()
-        if len(self.queue) > self.config['maxCapacity']:
+                granted.append(entry)
+        return granted, waits, blocked
+
+    def release(self, granted, waits, blocked):
+        # resolves the calls that got their tokens and takes them out of the queue with the cancelled calls
+        self.blocked = blocked
+        now = time() * 1000
+        for future, costs, timestamp in granted:
+            # a call cancelled while the backend spent its tokens stays cancelled
+            if not future.done():
+                future.set_result(None)
+                wait = now - timestamp
+                self.stats['released'] += 1
+                self.stats['waitTime'] += wait
+                self.stats['maxWaitTime'] = max(self.stats['maxWaitTime'], wait)
+        released = set(id(entry) for entry in granted)
+        for priority in sorted(self.lanes):
+            queue = self.lanes[priority]
+            while queue and (id(queue[0]) in released or queue[0][0].done()):
+                released.discard(id(queue.popleft()))
+                self.length -= 1
+            if released and queue:
+                # calls behind a blocked call got their tokens
+                kept = collections.deque(entry for entry in queue if id(entry) not in released)
+                for entry in queue:
+                    released.discard(id(entry))
+                self.length -= len(queue) - len(kept)
+                queue = self.lanes[priority] = kept
+            if not queue:
+                del self.lanes[priority]
+        return waits
+
+    def admit(self):
+        # moves the calls that wait for room into the queue, returns the number moved
+        admitted = 0
+        for priority in sorted(self.waiting):
+            queue = self.waiting[priority]
+            while queue and self.length <= self.config['maxCapacity']:
+                entry = queue.popleft()
+                self.waiting_length -= 1
+                if not entry[0].done():
+                    self.enqueue(priority, entry)
+                    admitted += 1
+            if not queue:
+                del self.waiting[priority]
+        return admitted
+
+    def enqueue(self, priority, entry):
+        if priority not in self.lanes:
+            self.lanes[priority] = collections.deque()
+        self.lanes[priority].append(entry)
+        self.length += 1
+        self.stats['maxLength'] = max(self.stats['maxLength'], self.length)
+
+    def reject(self, error):
+        # fails the queued and the waiting calls
+        for lanes in (self.lanes, self.waiting):
+            for queue in lanes.values():
+                for future, costs, timestamp in queue:
+                    if not future.done():
+                        future.set_exception(error)
+        self.lanes = {}
+        self.waiting = {}
+        self.length = 0
+        self.waiting_length = 0
+
+    def schedule(self, waits):
+        # sleeps until exactly enough tokens are back
+        if not self.length:
+            self.running = False
+            return
+        delay = min(waits) / 1000 if waits else 0
+        self.timer = self.get_loop().call_later(max(delay, self.config['delay']), self.drain)
+
+    def drain(self):
+        # releases the calls the tokens allow and then sleeps until exactly enough tokens are back
+        self.timer = None
+        if self.config['backend'] is not None:
+            # the backend waits for a lock, a file or the network, outside of the event loop
+            asyncio.ensure_future(self.drain_backend())
+            return
+        waits = self.release(*self.plan(self.entries()))
+        if self.waiting and self.admit():
+            waits = self.release(*self.plan(self.entries()))
+        self.schedule(waits)
+
+    async def drain_backend(self):
+        waits = []
+        try:
+            entries = [entry for entry in self.entries() if not entry[0].done()]
+            waits = self.release(*await self.get_loop().run_in_executor(None, self.plan, entries))
+            if self.waiting and self.admit():
+                # the admitted calls spend their tokens on the next wakeup
+                waits = [0]
+        except asyncio.CancelledError:
+            self.running = False
+            raise
+        except Exception as error:
+            # the calls fail with the error of the backend instead of waiting forever
+            self.reject(error)
+        self.schedule(waits)
+
+    def __call__(self, cost=None, priority=None):
+        # priority is a name from priorities or a number
+        future = asyncio.Future(loop=self.loop)
+        full = self.waiting or self.length > self.config['maxCapacity']
+        if full and not self.config['backpressure']:
             raise RuntimeError('throttle queue is over maxCapacity (' + str(int(self.config['maxCapacity'])) + '), see https://github.com/ccxt/ccxt/issues/11645#issuecomment-1195695526')
-        self.queue.append((future, cost))
+        if isinstance(cost, dict):
+            for name in cost:
+                if name not in self.buckets:
+                    raise ValueError('unknown throttle bucket ' + str(name) + ', configure it in tokenBucket["buckets"]')
+            costs = cost
+        else:
+            costs = {'default': self.config['cost'] if cost is None else cost}
+        if priority is None:
+            priority = self.config['priority']
+        if isinstance(priority, str):
+            if priority not in priorities:
+                raise ValueError('unknown throttle priority ' + priority + ', use one of ' + ', '.join(priorities))
+            priority = priorities[priority]
+        entry = (future, costs, time() * 1000)
+        if full:
+            # the future resolves once the call got into the queue and through it
+            if priority not in self.waiting:
+                self.waiting[priority] = collections.deque()
+            self.waiting[priority].append(entry)
+            self.waiting_length += 1
+            self.stats['backpressured'] += 1
+            return future
+        self.enqueue(priority, entry)
         if not self.running:
             self.running = True
-            asyncio.ensure_future(self.looper(), loop=self.loop)
+            self.drain()
+        elif self.timer is not None and self.blocked.isdisjoint(costs):
+            # nothing waits for these buckets, the wakeup may be far away, a drain of the backend picks the call up
+            self.timer.cancel()
+            self.drain()
         return future
+
+    def metrics(self):
+        released = self.stats['released']
+        return dict(self.stats, **{
+            'length': self.length,
+            'waiting': self.waiting_length,
+            'averageWaitTime': self.stats['waitTime'] / released if released else 0,
+        })
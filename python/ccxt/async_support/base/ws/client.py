@@ -7,20 +7,38 @@ except ImportError:
     pass
 
 import json
+import collections
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 
 from asyncio import sleep, ensure_future, wait_for, TimeoutError, BaseEventLoop, Future as asyncioFuture
-from .functions import milliseconds, iso8601, deep_extend, is_json_encoded_object
-from ccxt import NetworkError, RequestTimeout
+from .functions import milliseconds, iso8601, deep_extend
+from .decoders import json_decoder, is_json_encoded_frame, decode_frame
+from ccxt import NetworkError, RequestTimeout, NotSupported
 from ccxt.async_support.base.ws.future import Future
-from ccxt.async_support.base.ws.functions import gunzip, inflate
+from ccxt.async_support.base.ws.functions import gunzip_bytes, inflate
 from typing import Dict
 
 from aiohttp import WSMsgType
 
+# the pools shared by the clients with offload 'thread' or 'process', by kind and number of workers
+offload_executors = {}
+
+
+def offload_executor(offload, workers=None):
+    if isinstance(offload, Executor):
+        return offload
+    if offload not in ('thread', 'process'):
+        raise NotSupported('unknown ws offload ' + str(offload) + ', use thread, process or an Executor')
+    key = (offload, workers)
+    if key not in offload_executors:
+        offload_executors[key] = ThreadPoolExecutor(workers) if offload == 'thread' else ProcessPoolExecutor(workers)
+    return offload_executors[key]
+
 
 class Client(object):
 
     url = None
+    key = None  # the key of the client in exchange.clients, the url or the url and the index of a pooled connection
     ws = None
     futures: Dict[str, Future] = {}
     options = {}  # ws-specific options
@@ -46,6 +64,13 @@ class Client(object):
     verbose = False  # verbose output
     gunzip = False
     inflate = False
+    compress = 0  # the window bits of permessage-deflate to negotiate, 15 where the exchange supports it, aiohttp inflates the frames
+    decoder = None  # the json decoder of the messages, a name from json_decoders or a callable
+    # text and binary frames are decompressed and decoded on a pool, 'thread', 'process' or an Executor
+    # the decoded messages are handled in the order of the frames, the typed channels and decoder callables need threads
+    offload = None
+    offloadWorkers = None
+    typed_channels = None  # the (match, match bytes, decode, handler) of the channels decoded into structs, see typed_decoders()
     throttle = None
     connecting = False
     asyncio_loop: BaseEventLoop = None
@@ -54,6 +79,7 @@ class Client(object):
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         defaults = {
             'url': url,
+            'key': url,
             'futures': {},
             'subscriptions': {},
             'rejections': {},
@@ -72,6 +98,13 @@ class Client(object):
                 setattr(self, key, settings[key])
         # connection-related Future
         self.connected = Future()
+        self.decode = json_decoder(self.decoder)
+        self.pending = collections.deque()  # the (future, message, process) of the offloaded frames
+        self.executor = None
+        if self.offload:
+            self.executor = offload_executor(self.offload, self.offloadWorkers)
+            if isinstance(self.executor, ProcessPoolExecutor) and (callable(self.decoder) or self.typed_channels):
+                raise NotSupported('ws offload to processes supports the decoders of json_decoders only, without typed channels')
 
     def future(self, message_hash):
         if message_hash not in self.futures or self.futures[message_hash].cancelled():
@@ -217,30 +250,88 @@ class Client(object):
     def handle_text_or_binary_message(self, data):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'message', data)
-        if isinstance(data, bytes):
-            data = data.decode()
-        # decoded = json.loads(data) if is_json_encoded_object(data) else data
-        decode = None
-        if is_json_encoded_object(data):
-            if orjson is None:
-                decode = json.loads(data)
+        callback, message = self.decode_data(data)
+        callback(self, message)
+
+    def decode_data(self, data):
+        # returns the callback and the message of the text or the decompressed binary data of a frame
+        # json is decoded straight from the bytes of the frame, other messages are passed on as str
+        if is_json_encoded_frame(data):
+            if self.typed_channels:
+                typed = self.decode_typed_message(data)
+                if typed is not None:
+                    return typed
+            return self.on_message_callback, self.decode(data)
+        elif isinstance(data, bytes):
+            return self.on_message_callback, data.decode()
+        return self.on_message_callback, data
+
+    def decode_typed_message(self, data):
+        binary = not isinstance(data, str)
+        for match, match_bytes, decode, handler in self.typed_channels:
+            if data.find(match_bytes if binary else match) >= 0:
+                try:
+                    return handler, decode(data)
+                except ValueError:
+                    # not the expected shape, the usual path handles it
+                    return None
+        return None
+
+    def decompress(self, data):
+        # the decompressed bytes go to the json decoder as they are
+        if self.gunzip:
+            return gunzip_bytes(data)
+        elif self.inflate:
+            return inflate(data)
+        return data
+
+    def decode_message(self, message):
+        # runs on the worker threads with offload
+        data = message.data
+        if message.type == WSMsgType.BINARY:
+            data = self.decompress(data)
+        return self.decode_data(data)
+
+    def offload_message(self, message):
+        process = isinstance(self.executor, ProcessPoolExecutor)
+        if message.type == WSMsgType.TEXT or message.type == WSMsgType.BINARY:
+            if process:
+                binary = message.type == WSMsgType.BINARY
+                future = self.asyncio_loop.run_in_executor(self.executor, decode_frame, message.data, binary and self.gunzip, binary and self.inflate, self.decoder)
             else:
-                decode = orjson.loads(data)
+                future = self.asyncio_loop.run_in_executor(self.executor, self.decode_message, message)
         else:
-            decode = data
-        self.on_message_callback(self, decode)
+            # control frames wait for the frames before them
+            future = self.asyncio_loop.create_future()
+            future.set_result(None)
+        self.pending.append((future, message, process))
+        future.add_done_callback(self.deliver)
+
+    def deliver(self, done=None):
+        while self.pending and self.pending[0][0].done():
+            future, message, process = self.pending.popleft()
+            if future.cancelled():
+                continue
+            result = future.result()
+            if message.type != WSMsgType.TEXT and message.type != WSMsgType.BINARY:
+                self.handle_message(message, False)
+            elif process:
+                self.on_message_callback(self, result)
+            else:
+                callback, decoded = result
+                callback(self, decoded)
 
-    def handle_message(self, message):
+    def handle_message(self, message, offload=True):
         # self.log(iso8601(milliseconds()), message)
-        if message.type == WSMsgType.TEXT:
+        if offload and self.executor is not None and (message.type == WSMsgType.TEXT or message.type == WSMsgType.BINARY or self.pending):
+            if self.verbose and (message.type == WSMsgType.TEXT or message.type == WSMsgType.BINARY):
+                # the workers decode the frame, compressed frames are logged as they were received
+                self.log(iso8601(milliseconds()), 'message', message.data)
+            self.offload_message(message)
+        elif message.type == WSMsgType.TEXT:
             self.handle_text_or_binary_message(message.data)
         elif message.type == WSMsgType.BINARY:
-            data = message.data
-            if self.gunzip:
-                data = gunzip(data)
-            elif self.inflate:
-                data = inflate(data)
-            self.handle_text_or_binary_message(data)
+            self.handle_text_or_binary_message(self.decompress(message.data))
         # autoping is responsible for automatically replying with pong
         # to a ping incoming from a server, we have to disable autoping
         # with aiohttp's websockets and respond with pong manually
@@ -272,8 +363,8 @@ class Client(object):
         # call aenter here to simulate async with otherwise we get the error "await not called with future"
         # if connecting to a non-existent endpoint
         if (self.proxy):
-            return session.ws_connect(self.url, autoping=False, autoclose=False, headers=self.options.get('headers'), proxy=self.proxy, max_msg_size=10485760).__aenter__()
-        return session.ws_connect(self.url, autoping=False, autoclose=False, headers=self.options.get('headers'), max_msg_size=10485760).__aenter__()
+            return session.ws_connect(self.url, autoping=False, autoclose=False, headers=self.options.get('headers'), proxy=self.proxy, max_msg_size=10485760, compress=self.compress).__aenter__()
+        return session.ws_connect(self.url, autoping=False, autoclose=False, headers=self.options.get('headers'), max_msg_size=10485760, compress=self.compress).__aenter__()
 
     async def send(self, message):
         if self.verbose:
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+from typing import List, Optional
+from zlib import decompress, MAX_WBITS
+
+from ccxt.base.errors import NotSupported
+
+# the json decoders of the ws messages, selected with options['ws']['decoder']
+# every decoder takes the frame as bytes or str, the bytes are not decoded to str first
+# orjson, msgspec and simdjson also take a memoryview
+#
+#     'decoder': 'msgspec',        # a name from json_decoders
+#     'decoder': my_loads,         # or any callable
+
+
+def load_orjson():
+    import orjson
+    return orjson.loads
+
+
+def load_ujson():
+    import ujson
+    return ujson.loads
+
+
+def load_msgspec():
+    import msgspec
+    return msgspec.json.Decoder().decode
+
+
+def load_simdjson():
+    import simdjson
+    # a parser is not thread-safe, every thread that decodes, like the offload threads, has its own
+    local = threading.local()
+
+    def decode(data):
+        parser = getattr(local, 'parser', None)
+        if parser is None:
+            parser = local.parser = simdjson.Parser()
+        # the parser reuses its buffers, the documents are converted to python objects right away
+        document = parser.parse(data)
+        return document.as_dict() if isinstance(document, simdjson.Object) else document.as_list() if isinstance(document, simdjson.Array) else document
+
+    return decode
+
+
+json_decoders = {
+    'json': lambda: json.loads,
+    'orjson': load_orjson,
+    'ujson': load_ujson,
+    'msgspec': load_msgspec,
+    'simdjson': load_simdjson,
+}
+
+packages = {
+    'orjson': 'orjson',
+    'ujson': 'ujson',
+    'msgspec': 'msgspec',
+    'simdjson': 'pysimdjson',
+}
+
+
+def json_decoder(decoder=None):
+    # None is orjson when it is installed and json otherwise
+    if callable(decoder):
+        return decoder
+    if decoder is None:
+        try:
+            return load_orjson()
+        except ImportError:
+            return json.loads
+    if decoder not in json_decoders:
+        raise NotSupported('unknown ws decoder ' + str(decoder) + ', use one of ' + ', '.join(json_decoders))
+    try:
+        return json_decoders[decoder]()
+    except ImportError:
+        raise NotSupported('the ' + decoder + ' ws decoder requires the ' + packages[decoder] + ' package, pip install ' + packages[decoder])
+
+
+def is_json_encoded_frame(data):
+    # the check of is_json_encoded_object() for bytes and str, without decoding the bytes
+    if len(data) < 2:
+        return False
+    first = data[0]
+    return first == '{' or first == '[' or first == 123 or first == 91
+
+
+# compact schemas of the hot channels, options['ws']['typedChannels'] turns them on, True or a list of names
+# a message that contains match, or one of the strings of a list, is decoded straight into a slot-based struct
+# with the fields below and handed to the handle_typed_<channel> method of the exchange
+# the method named in handler, the usual handler of the channel, gets the fields as a dict instead of the struct
+# without msgspec, without a handler or when the message does not fit the schema, the message takes the usual path
+#
+#     str, int, float, bool   the json type of the field
+#     levels                  a list of price levels, lists of strings
+#     {...}                   a nested object
+#     [{...}]                 a list of nested objects
+#     str?, int?, ...         a field that may be missing, None in the struct and left out of the dict
+#
+# the fields that are not listed are skipped by the decoder, a message without a required field does not fit
+
+ws_schemas = {
+    'binance': {
+        'bookTicker': {
+            # the spot frames start with the update id, the 24hrTicker frames also have "B":" but start with "e"
+            'match': ['{"u":', '"e":"bookTicker"'],
+            'handler': 'handle_bids_asks',
+            'fields': {'e': 'str?', 'u': 'int?', 'E': 'int?', 'T': 'int?', 's': 'str', 'b': 'str', 'B': 'str', 'a': 'str', 'A': 'str'},
+        },
+    },
+}
+
+
+def schema_type(name, schema, msgspec):
+    if isinstance(schema, dict):
+        fields = []
+        for key, value in schema.items():
+            if isinstance(value, str) and value.endswith('?'):
+                fields.append((key, Optional[schema_type(name + '_' + key, value[:-1], msgspec)], None))
+            else:
+                fields.append((key, schema_type(name + '_' + key, value, msgspec)))
+        # no gc tracking, the structs only hold strings and numbers
+        # kw_only lets the required fields follow the optional ones, omit_defaults leaves the missing ones out of the dicts
+        return msgspec.defstruct(name, fields, kw_only=True, omit_defaults=True, gc=False)
+    if isinstance(schema, list):
+        return List[schema_type(name, schema[0], msgspec)]
+    return {
+        'str': str,
+        'int': int,
+        'float': float,
+        'bool': bool,
+        'levels': List[List[str]],
+    }[schema]
+
+
+def typed_decoders(schemas, plain=()):
+    # schemas is {name: (schema, handler)}, returns the (match, match bytes, decode, handler) of every channel or None without msgspec
+    # the channels in plain are decoded into dicts of the fields, for the handlers that take the usual messages
+    try:
+        import msgspec
+    except ImportError:
+        return None
+    decoders = []
+    for name, (schema, handler) in schemas.items():
+        decode = msgspec.json.Decoder(schema_type(name, schema['fields'], msgspec)).decode
+        if name in plain:
+            decode = (lambda decode: lambda data: msgspec.to_builtins(decode(data)))(decode)
+        matches = schema['match'] if isinstance(schema['match'], list) else [schema['match']]
+        for match in matches:
+            decoders.append((match, match.encode(), decode, handler))
+    return decoders
+
+
+# the decoders of the worker processes, see Client.offload
+process_decoders = {}
+
+
+def decode_frame(data, gunzip=False, inflate=False, decoder=None):
+    # decompresses and decodes the data of a frame in a worker process, decoder is a name from json_decoders or None
+    if gunzip:
+        data = decompress(data, 16 + MAX_WBITS)
+    elif inflate:
+        data = decompress(data, -MAX_WBITS)
+    if is_json_encoded_frame(data):
+        if decoder not in process_decoders:
+            process_decoders[decoder] = json_decoder(decoder)
+        return process_decoders[decoder](data)
+    return data.decode() if isinstance(data, bytes) else data
@@ -2,8 +2,6 @@
 
 from zlib import decompress, MAX_WBITS
 from base64 import b64decode
-from gzip import GzipFile
-from io import BytesIO
 import time
 import datetime
 
@@ -16,8 +14,13 @@ def inflate64(data):
     return inflate(b64decode(data))
 
 
+def gunzip_bytes(data):
+    # every frame is a whole gzip stream, the one-shot zlib call skips the file objects of GzipFile
+    return decompress(data, 16 + MAX_WBITS)
+
+
 def gunzip(data):
-    return GzipFile('', 'rb', 9, BytesIO(data)).read().decode('utf-8')
+    return gunzip_bytes(data).decode('utf-8')
 
 
 #  Tmp : added methods below to avoid circular imports between exchange.py and aiohttp.py
@@ -8,6 +8,8 @@ import sys
 class OrderBook(dict):
     def __init__(self, snapshot={}, depth=None):
         self.cache = []
+        self.checksum = None  # OrderBookChecksum, see Exchange.order_book_checksum()
+        self.aggregations = {}  # grouped views by price step, see aggregated()
         depth = depth or sys.maxsize
         defaults = {
             'bids': [],
@@ -32,15 +34,50 @@ class OrderBook(dict):
         self['bids'].limit()
         return self
 
+    def set_depth_view(self, enabled=True):
+        # keep the full depth and make limit() expose the top levels without trimming or copying
+        self['asks'].view = enabled
+        self['bids'].view = enabled
+        return self
+
+    def set_wire_strings(self, enabled=True):
+        # prices and sizes may be stored as wire strings, the levels keep them as StringFloat
+        self['asks'].strings = enabled
+        self['bids'].strings = enabled
+        return self
+
+    def set_tick_size(self, tick):
+        # key the levels by their integer number of ticks, pass None to go back to float keys
+        self['asks'].set_tick_size(tick)
+        self['bids'].set_tick_size(tick)
+        return self
+
+    def aggregated(self, tick=None):
+        # an L2 book of the levels summed by price, or grouped by multiples of tick
+        # it follows every update of this book, so reading it costs nothing per level
+        view = self.aggregations.get(tick)
+        if view is None:
+            view = OrderBook({
+                'asks': order_book_side.AggregatedAsks(tick),
+                'bids': order_book_side.AggregatedBids(tick),
+            })
+            self['asks'].attach_view(view['asks'])
+            self['bids'].attach_view(view['bids'])
+            self.aggregations[tick] = view
+        for key in ['timestamp', 'datetime', 'nonce', 'symbol']:
+            view[key] = self[key]
+        return view
+
+    def to_numpy(self, depth=None):
+        # float64 arrays of shape (n, 2), or (n, 3) for counted books, requires numpy
+        return {
+            'bids': self['bids'].as_array(depth),
+            'asks': self['asks'].as_array(depth),
+        }
+
     def reset(self, snapshot={}):
-        self['asks']._index.clear()
-        self['asks'].clear()
-        for ask in snapshot.get('asks', []):
-            self['asks'].storeArray(ask)
-        self['bids']._index.clear()
-        self['bids'].clear()
-        for bid in snapshot.get('bids', []):
-            self['bids'].storeArray(bid)
+        self['asks'].store_snapshot(snapshot.get('asks', []))
+        self['bids'].store_snapshot(snapshot.get('bids', []))
         self['nonce'] = snapshot.get('nonce')
         self['timestamp'] = snapshot.get('timestamp')
         self['datetime'] = Exchange.iso8601(self['timestamp'])
@@ -76,3 +113,24 @@ class IndexedOrderBook(OrderBook):
             'bids': order_book_side.IndexedBids(snapshot.get('bids', []), depth),
         })
         super(IndexedOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# the same books backed by chunked sorted sides with O(log n) inserts and deletes
+
+
+class TreeOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.TreeAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.TreeBids(snapshot.get('bids', []), depth),
+        })
+        super(TreeOrderBook, self).__init__(copy, depth)
+
+
+class TreeCountedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.TreeCountedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.TreeCountedBids(snapshot.get('bids', []), depth),
+        })
+        super(TreeCountedOrderBook, self).__init__(copy, depth)
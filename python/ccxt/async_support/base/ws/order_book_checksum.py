@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+from binascii import crc32
+
+from ccxt.base.decimal_to_precision import number_to_string
+from ccxt.async_support.base.ws.order_book_side import StringFloat
+
+# -----------------------------------------------------------------------------
+# declarative order book checksum formats, keyed by exchange id
+#
+#     depth       levels per side that go into the payload
+#     interleave  bid, ask, bid, ask... instead of one side after the other
+#     first       the side that goes first when the sides are not interleaved
+#     separator   joins the price and the size and the levels with each other
+#     digits      drops the decimal point and the leading zeros of every value
+#     decimals    pads every value to a fixed number of decimals before that,
+#                 'market' pads prices and sizes to the precision of the market
+#     negateAsks  ask sizes are negative in the payload
+#     key         the position of the first value of a level (price or order id)
+#     raw         the position of the [price, size] wire strings inside a level
+#     signed      the checksum is a signed 32-bit integer
+
+checksum_formats = {
+    'okx': {
+        'depth': 25,
+        'interleave': True,
+        'separator': ':',
+        'signed': True,
+    },
+    'bitget': {
+        'depth': 25,
+        'interleave': True,
+        'separator': ':',
+        'raw': 2,
+        'signed': True,
+    },
+    'coincatch': {
+        'depth': 25,
+        'interleave': True,
+        'separator': ':',
+        'raw': 2,
+        'signed': True,
+    },
+    'bitfinex': {
+        'depth': 25,
+        'interleave': True,
+        'separator': ':',
+        'negateAsks': True,
+        'signed': True,
+    },
+    'kraken': {
+        'depth': 10,
+        'interleave': False,
+        'first': 'asks',
+        'separator': '',
+        'digits': True,
+        'decimals': 'market',
+        'signed': False,
+    },
+    'independentreserve': {
+        'depth': 10,
+        'interleave': False,
+        'first': 'bids',
+        'separator': '',
+        'digits': True,
+        'decimals': 8,
+        'signed': True,
+    },
+}
+
+
+class OrderBookChecksum(object):
+    """Computes the checksum of the top levels of an order book, formatting only the levels that changed"""
+
+    def __init__(self, spec, decimals=None):
+        # decimals is the (price, size) pair of the market when the format pads to the market,
+        # without it the format only takes the wire strings, see OrderBook.set_wire_strings()
+        self.depth = spec.get('depth', 25)
+        self.interleave = spec.get('interleave', True)
+        self.first = spec.get('first', 'bids')
+        self.separator = spec.get('separator', ':')
+        self.digits = spec.get('digits', False)
+        self.decimals = spec.get('decimals')
+        self.wire_strings = False
+        if self.decimals == 'market':
+            self.wire_strings = decimals is None
+            self.decimals = decimals
+        elif self.decimals is not None:
+            self.decimals = (self.decimals, self.decimals)
+        self.negate_asks = spec.get('negateAsks', False)
+        self.key = spec.get('key', 0)
+        self.raw = spec.get('raw')
+        self.signed = spec.get('signed', True)
+        # formatted strings of the levels used by the previous payload, {key: (size, string)}
+        self._cache = {
+            'bids': {},
+            'asks': {},
+        }
+
+    def format_value(self, value, negate=False, decimals=None):
+        if isinstance(value, str):
+            string = value
+        elif isinstance(value, StringFloat):
+            # the text the exchange sent, see OrderBook.set_wire_strings()
+            string = value.string
+        elif decimals is not None:
+            string = format(value, '.' + str(decimals) + 'f')
+        elif self.wire_strings:
+            raise ValueError('the checksum format needs the wire strings or the precision of the market, ' + repr(value) + ' has neither')
+        else:
+            string = number_to_string(value)
+        if negate:
+            string = string[1:] if string.startswith('-') else '-' + string
+        if self.digits:
+            string = string.replace('.', '').lstrip('0') or '0'
+        return string
+
+    def format_level(self, level, negate):
+        if self.raw is not None:
+            price, size = level[self.raw][0], level[self.raw][1]
+        else:
+            price, size = level[self.key], level[1]
+        price_decimals, size_decimals = self.decimals or (None, None)
+        return self.format_value(price, False, price_decimals) + self.separator + self.format_value(size, negate, size_decimals)
+
+    def strings(self, bookside, key):
+        cache = self._cache[key]
+        fresh = {}
+        strings = []
+        negate = self.negate_asks and key == 'asks'
+        for level in itertools.islice(bookside, self.depth):
+            level_key = level[self.key]
+            size = level[1]
+            entry = cache.get(level_key)
+            if entry is None or entry[0] is not size:
+                entry = (size, self.format_level(level, negate))
+            fresh[level_key] = entry
+            strings.append(entry[1])
+        self._cache[key] = fresh
+        return strings
+
+    def payload(self, orderbook):
+        bids = self.strings(orderbook['bids'], 'bids')
+        asks = self.strings(orderbook['asks'], 'asks')
+        if self.interleave:
+            strings = [string for pair in itertools.zip_longest(bids, asks) for string in pair if string is not None]
+        elif self.first == 'asks':
+            strings = asks + bids
+        else:
+            strings = bids + asks
+        return self.separator.join(strings)
+
+    def __call__(self, orderbook):
+        unsigned = crc32(self.payload(orderbook).encode('utf8'))
+        if self.signed and (unsigned >= 0x80000000):
+            return unsigned - 0x100000000
+        return unsigned
@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import sys
+import math
 import bisect
+import itertools
+import operator
+from decimal import Decimal
+
+from ccxt.base.errors import NotSupported
 
 """Author: Carlo Revelli"""
 """Fast bisect bindings"""
@@ -9,8 +15,27 @@ import bisect
 """Performs a binary search when inserting keys in sorted order"""
 
 
+class StringFloat(float):
+    """A float that keeps the wire string it was parsed from"""
+    __slots__ = ('string',)
+
+    def __new__(cls, string):
+        value = super(StringFloat, cls).__new__(cls, string)
+        value.string = string
+        return value
+
+    def __getnewargs__(self):
+        return (self.string,)
+
+
 class OrderBookSide(list):
     side = None  # set to True for bids and False for asks
+    columns = 2  # numeric values per level exported by as_array()
+    view = False  # keep every level and only expose the top depth levels, see limit()
+    strings = False  # accept wire strings for prices and sizes and keep them next to the floats
+    merge_ratio = 8  # store_deltas() rebuilds the side when a message has more than 1 / merge_ratio of its levels
+    tick = None  # key prices by their integer number of ticks instead of the float, see set_tick_size()
+    views = ()  # aggregated sides that follow the changes of this side, see attach_view()
 
     def __init__(self, deltas=[], depth=None):
         super(OrderBookSide, self).__init__()
@@ -18,50 +43,240 @@ class OrderBookSide(list):
         self._n = sys.maxsize
         # parallel to self
         self._index = []
-        for delta in deltas:
-            self.storeArray(list(delta))
+        if deltas:
+            self.store_snapshot([list(delta) for delta in deltas])
 
     def store_array(self, delta):
         return self.storeArray(delta)
 
     def storeArray(self, delta):
+        if self.strings:
+            self.parse_strings(delta)
         price = delta[0]
         size = delta[1]
-        index_price = -price if self.side else price
+        key = price if self.tick is None else round(price / self.tick)
+        index_price = -key if self.side else key
         index = bisect.bisect_left(self._index, index_price)
         if size:
             if index < len(self._index) and self._index[index] == index_price:
-                self[index][1] = size
+                level = list.__getitem__(self, index)
+                if self.views:
+                    self.notify(level[0], size, 0, level[1])
+                level[1] = size
             else:
                 self._index.insert(index, index_price)
                 self.insert(index, delta)
+                if self.views:
+                    self.notify(price, size, 1)
         elif index < len(self._index) and self._index[index] == index_price:
+            if self.views:
+                level = list.__getitem__(self, index)
+                self.notify(level[0], -level[1], -1)
             del self._index[index]
             del self[index]
 
     def store(self, price, size):
         self.storeArray([price, size])
 
+    def store_many(self, prices, sizes, counts_or_ids=None):
+        # applies all the deltas of one message in a single call
+        if counts_or_ids is None:
+            deltas = [[price, size] for price, size in zip(prices, sizes)]
+        else:
+            deltas = [[price, size, count_or_id] for price, size, count_or_id in zip(prices, sizes, counts_or_ids)]
+        if self.strings:
+            for delta in deltas:
+                self.parse_strings(delta)
+        self.store_deltas(deltas)
+
+    def store_deltas(self, deltas):
+        # exchanges send the levels of a message sorted from the top of the book
+        keys = self.index_keys(deltas)
+        index_keys = self._index
+        if len(deltas) * self.merge_ratio < len(index_keys):
+            if self.views or any(previous >= key for previous, key in zip(keys, keys[1:])):
+                for delta in deltas:
+                    self.storeArray(delta)
+                return
+            # a few sorted levels, every bisect starts where the previous one ended
+            is_live = self.is_live
+            start = 0
+            for key, delta in zip(keys, deltas):
+                index = bisect.bisect_left(index_keys, key, start)
+                found = index < len(index_keys) and index_keys[index] == key
+                if is_live(delta):
+                    if found:
+                        self.update_level(list.__getitem__(self, index), delta)
+                    else:
+                        index_keys.insert(index, key)
+                        self.insert(index, delta)
+                elif found:
+                    del index_keys[index]
+                    del self[index]
+                start = index
+            return
+        levels = dict(zip(index_keys, list.__getitem__(self, slice(None))))
+        self._index, levels = self.sort_levels(keys, deltas, levels)
+        list.__setitem__(self, slice(None), levels)
+        if self.views:
+            self.rebuild_views()
+
+    def store_snapshot(self, deltas):
+        # replaces all the levels, sorting once instead of bisecting every level
+        self.clear()
+        if self.strings:
+            for delta in deltas:
+                self.parse_strings(delta)
+        self._index, levels = self.sort_levels(self.index_keys(deltas), deltas, {})
+        list.__setitem__(self, slice(None), levels)
+        if self.views:
+            self.rebuild_views()
+
+    def index_key(self, price):
+        key = price if self.tick is None else round(price / self.tick)
+        return -key if self.side else key
+
+    def index_keys(self, deltas):
+        tick = self.tick
+        keys = [delta[0] if tick is None else round(delta[0] / tick) for delta in deltas]
+        return [-key for key in keys] if self.side else keys
+
+    def sort_levels(self, keys, deltas, levels):
+        # the deltas go through a dict of the levels in message order, then the sort
+        # merges the sorted run of the old levels with the run of the new ones, O(n) if both are sorted
+        is_live = self.is_live
+        update_level = self.update_level
+        for key, delta in zip(keys, deltas):
+            if not is_live(delta):
+                levels.pop(key, None)
+            elif key in levels:
+                update_level(levels[key], delta)
+            else:
+                levels[key] = delta
+        keys = sorted(levels)
+        return keys, list(map(levels.__getitem__, keys))
+
+    def is_live(self, delta):
+        return delta[1]
+
+    def update_level(self, level, delta):
+        level[1] = delta[1]
+
+    def parse_strings(self, delta):
+        # updates of existing levels copy the size, and the wire string travels with it
+        price = delta[0]
+        size = delta[1]
+        if isinstance(price, str):
+            delta[0] = StringFloat(price)
+        if isinstance(size, str):
+            delta[1] = StringFloat(size)
+        return delta
+
     def limit(self):
-        difference = len(self) - self._depth
-        for _ in range(difference):
-            self.remove_index(self.pop())
-            self._index.pop()
+        if self.view:
+            # nothing is trimmed or copied, reads are bounded by self._n instead
+            self._n = self._depth
+            return
+        if len(self) > self._depth:
+            for order in list.__getitem__(self, slice(self._depth, None)):
+                self.remove_index(order)
+                if self.views:
+                    self.notify(order[0], -order[1], -1)
+            del self[self._depth:]
+            del self._index[self._depth:]
 
     def remove_index(self, order):
         pass
 
+    def set_tick_size(self, tick):
+        # integer keys compare exactly and avoid float drift between equal prices
+        # every price must lie on the grid of the tick, existing levels are keyed again
+        self.tick = tick
+        self.store_snapshot(list.__getitem__(self, slice(None)))
+        return self
+
+    def as_array(self, depth=None):
+        # the levels are flattened by C iterators, no python code runs per level
+        # numpy is only imported by the code that exports arrays
+        try:
+            import numpy
+        except ImportError:
+            raise NotSupported('OrderBookSide.as_array() requires numpy, install it with "pip install numpy"')
+        count = len(self) if depth is None else min(len(self), depth)
+        values = itertools.chain.from_iterable(map(operator.itemgetter(*range(self.columns)), itertools.islice(self, count)))
+        return numpy.fromiter(values, dtype=numpy.float64, count=count * self.columns).reshape(count, self.columns)
+
+    def clear(self):
+        self._index.clear()
+        super(OrderBookSide, self).clear()
+        for view in self.views:
+            view.clear()
+
+    def iter_levels(self):
+        # every stored level, regardless of the depth view
+        return list.__iter__(self)
+
+    def attach_view(self, view):
+        self.views = self.views + (view,)
+        self.rebuild_views()
+        return view
+
+    def rebuild_views(self):
+        for view in self.views:
+            view.clear()
+            view.set_price_tick(self.tick)
+            for level in self.iter_levels():
+                view.add(level[0], level[1], 1)
+
+    def notify(self, price, size, count, previous=0):
+        # the level or order at price goes from previous to size, count is the change of levels or orders
+        for view in self.views:
+            view.add(price, size, count, previous)
+
     def __len__(self):
         length = super(OrderBookSide, self).__len__()
         return min(length, self._n)
 
+    def __iter__(self):
+        iterator = super(OrderBookSide, self).__iter__()
+        return itertools.islice(iterator, self._n) if self.view else iterator
+
+    def __reversed__(self):
+        if self.view:
+            return reversed(self[:])
+        return super(OrderBookSide, self).__reversed__()
+
     def __getitem__(self, item):
         if isinstance(item, slice):
             start, stop, step = item.indices(len(self))
-            return [self[i] for i in range(start, stop, step)]
+            # a negative stop means the slice runs down to the first level
+            return super(OrderBookSide, self).__getitem__(slice(start, stop if stop >= 0 else None, step))
+        elif self.view:
+            length = len(self)
+            index = item + length if item < 0 else item
+            if index < 0 or index >= length:
+                raise IndexError('list index out of range')
+            return super(OrderBookSide, self).__getitem__(index)
         else:
             return super(OrderBookSide, self).__getitem__(item)
 
+    # the hidden levels of a depth view are not part of the side for the list methods either
+
+    def __contains__(self, level):
+        return self[:].__contains__(level) if self.view else super(OrderBookSide, self).__contains__(level)
+
+    def __add__(self, other):
+        return self[:] + other
+
+    def copy(self):
+        return self[:]
+
+    def count(self, level):
+        return self[:].count(level) if self.view else super(OrderBookSide, self).count(level)
+
+    def index(self, level, start=0, stop=sys.maxsize):
+        return self[:].index(level, start, stop) if self.view else super(OrderBookSide, self).index(level, start, stop)
+
     def __eq__(self, other):
         if isinstance(other, list):
             return list(self) == other
@@ -77,83 +292,99 @@ class OrderBookSide(list):
 
 
 class CountedOrderBookSide(OrderBookSide):
+    columns = 3
+
     def __init__(self, deltas=[], depth=None):
         super(CountedOrderBookSide, self).__init__(deltas, depth)
 
     def storeArray(self, delta):
+        if self.strings:
+            self.parse_strings(delta)
         price = delta[0]
         size = delta[1]
         count = delta[2]
-        index_price = -price if self.side else price
+        key = price if self.tick is None else round(price / self.tick)
+        index_price = -key if self.side else key
         index = bisect.bisect_left(self._index, index_price)
         if size and count:
             if index < len(self._index) and self._index[index] == index_price:
-                self[index][1] = size
-                self[index][2] = count
+                level = list.__getitem__(self, index)
+                if self.views:
+                    self.notify(level[0], size, 0, level[1])
+                level[1] = size
+                level[2] = count
             else:
                 self._index.insert(index, index_price)
                 self.insert(index, delta)
+                if self.views:
+                    self.notify(price, size, 1)
         elif index < len(self._index) and self._index[index] == index_price:
+            if self.views:
+                level = list.__getitem__(self, index)
+                self.notify(level[0], -level[1], -1)
             del self._index[index]
             del self[index]
 
     def store(self, price, size, count):
         self.storeArray([price, size, count])
 
+    def is_live(self, delta):
+        return delta[1] and delta[2]
+
+    def update_level(self, level, delta):
+        level[1] = delta[1]
+        level[2] = delta[2]
+
 # -----------------------------------------------------------------------------
 # indexed by order ids (3rd value in a bidask delta)
 
 
 class IndexedOrderBookSide(OrderBookSide):
+    # the index holds (price key, order id) pairs, so one bisect finds any order
+    # and self._hashmap keeps the stored level of every order id as its handle
+
     def __init__(self, deltas=[], depth=None):
         self._hashmap = {}
         super(IndexedOrderBookSide, self).__init__(deltas, depth)
 
     def storeArray(self, delta):
+        if self.strings:
+            self.parse_strings(delta)
         price = delta[0]
-        if price is not None:
-            index_price = -price if self.side else price
-        else:
-            index_price = None
         size = delta[1]
         order_id = delta[2]
-        if size:
-            if order_id in self._hashmap:
-                old_price = self._hashmap[order_id]
-                index_price = index_price or old_price
+        level = self._hashmap.get(order_id)
+        if level is not None:
+            if price is None:
                 # in case the price is not defined
-                delta[0] = abs(index_price)
-                # matches if price is not defined or if price matches
-                if index_price == old_price:
-                    # just overwrite the old index
-                    index = bisect.bisect_left(self._index, index_price)
-                    while self[index][2] != order_id:
-                        index += 1
-                    self._index[index] = index_price
-                    self[index] = delta
-                    return
-                else:
-                    # remove old price level
-                    old_index = bisect.bisect_left(self._index, old_price)
-                    while self[old_index][2] != order_id:
-                        old_index += 1
-                    del self._index[old_index]
-                    del self[old_index]
-            # insert new price level
-            self._hashmap[order_id] = index_price
-            index = bisect.bisect_left(self._index, index_price)
-            while index < len (self._index) and self._index[index] == index_price and self[index][2] < order_id:
-                index += 1
-            self._index.insert(index, index_price)
-            self.insert(index, delta)
-        elif order_id in self._hashmap:
-            old_price = self._hashmap[order_id]
-            index = bisect.bisect_left(self._index, old_price)
-            while self[index][2] != order_id:
-                index += 1
+                delta[0] = price = level[0]
+            if size and price == level[0]:
+                # the handle updates the order in place, there is nothing to search
+                if self.views:
+                    self.notify(price, size, 0, level[1])
+                level[:] = delta
+                return
+            # the order moves to another price or goes away
+            if self.views:
+                self.notify(level[0], -level[1], -1)
+            index = bisect.bisect_left(self._index, (self.index_key(level[0]), order_id))
             del self._index[index]
             del self[index]
             del self._hashmap[order_id]
+        if size and price is not None:
+            # the orders of one price are ordered by order id
+            # an order without a price that is not stored, like one trimmed by limit(), has no place
+            entry = (self.index_key(price), order_id)
+            index = bisect.bisect_left(self._index, entry)
+            self._index.insert(index, entry)
+            self.insert(index, delta)
+            self._hashmap[order_id] = delta
+            if self.views:
+                self.notify(price, size, 1)
+
+    def clear(self):
+        self._hashmap.clear()
+        super(IndexedOrderBookSide, self).clear()
 
     def remove_index(self, order):
         order_id = order[2]
@@ -163,6 +394,356 @@ class IndexedOrderBookSide(OrderBookSide):
     def store(self, price, size, order_id):
         self.storeArray([price, size, order_id])
 
+    def store_deltas(self, deltas):
+        for delta in deltas:
+            self.storeArray(delta)
+
+    def store_snapshot(self, deltas):
+        self.clear()
+        if self.strings:
+            for delta in deltas:
+                self.parse_strings(delta)
+        orders = {}
+        for delta in deltas:
+            if delta[1]:
+                orders[delta[2]] = delta
+            else:
+                orders.pop(delta[2], None)
+        levels = list(orders.values())
+        entries = sorted(zip(zip(self.index_keys(levels), orders.keys()), levels), key=operator.itemgetter(0))
+        self._index = [entry[0] for entry in entries]
+        self._hashmap = orders
+        list.__setitem__(self, slice(None), [entry[1] for entry in entries])
+        if self.views:
+            self.rebuild_views()
+
+# -----------------------------------------------------------------------------
+# keeps the levels in a chunked sorted structure (a two-level b+tree)
+# the bisect runs over the last key of every chunk and then inside one chunk
+# so inserts and deletes only move up to 2 * load references instead of the whole side
+# reads, slices and the list methods are served from the chunks, the underlying list stays empty
+# the list methods that write would write to that empty list, they raise NotSupported instead
+
+
+class TreeOrderBookSide(OrderBookSide):
+    load = 256
+
+    def __init__(self, deltas=[], depth=None):
+        self._keys = []  # chunks of index prices
+        self._levels = []  # chunks of levels, parallel to self._keys
+        self._maxes = []  # last index price of every chunk
+        self._size = 0
+        super(TreeOrderBookSide, self).__init__(deltas, depth)
+
+    def storeArray(self, delta):
+        if self.strings:
+            self.parse_strings(delta)
+        price = delta[0]
+        size = delta[1]
+        key = price if self.tick is None else round(price / self.tick)
+        index_price = -key if self.side else key
+        if size:
+            level = self._insert(index_price, delta)
+            if level is not delta:
+                if self.views:
+                    self.notify(level[0], size, 0, level[1])
+                level[1] = size
+            elif self.views:
+                self.notify(price, size, 1)
+        else:
+            level = self._delete(index_price)
+            if level is not None and self.views:
+                self.notify(level[0], -level[1], -1)
+
+    def _insert(self, index_price, delta):
+        # returns the stored level, which is not the delta if the price already exists
+        maxes = self._maxes
+        if not maxes:
+            self._keys.append([index_price])
+            self._levels.append([delta])
+            maxes.append(index_price)
+            self._size = 1
+            return delta
+        k = bisect.bisect_left(maxes, index_price)
+        if k == len(maxes):
+            k -= 1
+            keys = self._keys[k]
+            keys.append(index_price)
+            self._levels[k].append(delta)
+            maxes[k] = index_price
+        else:
+            keys = self._keys[k]
+            index = bisect.bisect_left(keys, index_price)
+            if keys[index] == index_price:
+                return self._levels[k][index]
+            keys.insert(index, index_price)
+            self._levels[k].insert(index, delta)
+        self._size += 1
+        if len(keys) > 2 * self.load:
+            self._split(k)
+        return delta
+
+    def _delete(self, index_price):
+        maxes = self._maxes
+        k = bisect.bisect_left(maxes, index_price)
+        if k == len(maxes):
+            return None
+        keys = self._keys[k]
+        index = bisect.bisect_left(keys, index_price)
+        if keys[index] != index_price:
+            return None
+        del keys[index]
+        level = self._levels[k].pop(index)
+        self._size -= 1
+        if not keys:
+            del self._keys[k]
+            del self._levels[k]
+            del maxes[k]
+        else:
+            maxes[k] = keys[-1]
+            if len(keys) < self.load // 2 and len(maxes) > 1:
+                self._merge(k if k + 1 < len(maxes) else k - 1)
+        return level
+
+    def _split(self, k):
+        keys = self._keys[k]
+        levels = self._levels[k]
+        half = len(keys) >> 1
+        self._keys[k:k + 1] = [keys[:half], keys[half:]]
+        self._levels[k:k + 1] = [levels[:half], levels[half:]]
+        self._maxes[k:k + 1] = [keys[half - 1], keys[-1]]
+
+    def _merge(self, k):
+        # merges the chunk k with the chunk k + 1
+        self._keys[k].extend(self._keys.pop(k + 1))
+        self._levels[k].extend(self._levels.pop(k + 1))
+        del self._maxes[k]
+        if len(self._keys[k]) > 2 * self.load:
+            self._split(k)
+
+    def _iter_from(self, index):
+        # the levels from index on, the chunks before it are skipped by their length
+        for k, levels in enumerate(self._levels):
+            if index < len(levels):
+                return itertools.chain(itertools.islice(levels, index, None), itertools.chain.from_iterable(self._levels[k + 1:]))
+            index -= len(levels)
+        return iter(())
+
+    def iter_levels(self):
+        return itertools.chain.from_iterable(self._levels)
+
+    def store_deltas(self, deltas):
+        # inserts and deletes are already bounded by the chunk size
+        for delta in deltas:
+            self.storeArray(delta)
+
+    def store_snapshot(self, deltas):
+        self.clear()
+        if self.strings:
+            for delta in deltas:
+                self.parse_strings(delta)
+        keys, levels = self.sort_levels(self.index_keys(deltas), deltas, {})
+        load = self.load
+        self._keys = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self._levels = [levels[i:i + load] for i in range(0, len(levels), load)]
+        self._maxes = [chunk[-1] for chunk in self._keys]
+        self._size = len(keys)
+        if self.views:
+            self.rebuild_views()
+
+    def set_tick_size(self, tick):
+        self.tick = tick
+        self.store_snapshot(list(self.iter_levels()))
+        return self
+
+    def limit(self):
+        if self.view:
+            self._n = self._depth
+            return
+        difference = self._size - self._depth
+        while difference > 0:
+            keys = self._keys[-1]
+            levels = self._levels[-1]
+            count = min(len(keys), difference)
+            for level in levels[-count:]:
+                self.remove_index(level)
+                if self.views:
+                    self.notify(level[0], -level[1], -1)
+            if count == len(keys):
+                self._keys.pop()
+                self._levels.pop()
+                self._maxes.pop()
+            else:
+                del keys[-count:]
+                del levels[-count:]
+                self._maxes[-1] = keys[-1]
+            self._size -= count
+            difference -= count
+
+    def clear(self):
+        self._keys = []
+        self._levels = []
+        self._maxes = []
+        self._size = 0
+        super(TreeOrderBookSide, self).clear()
+
+    def __len__(self):
+        return min(self._size, self._n)
+
+    def __iter__(self):
+        levels = self.iter_levels()
+        return itertools.islice(levels, self._n) if self._size > self._n else levels
+
+    def __reversed__(self):
+        if self._size > self._n:
+            return reversed(self[:])
+        return itertools.chain.from_iterable(map(reversed, reversed(self._levels)))
+
+    def __getitem__(self, item):
+        length = len(self)
+        if isinstance(item, slice):
+            start, stop, step = item.indices(length)
+            if step != 1:
+                return self[:][item]
+            # the top of the book lives in the first chunk, the slice only walks the chunks it covers
+            return list(itertools.islice(self._iter_from(start), max(stop - start, 0)))
+        index = item + length if item < 0 else item
+        if 0 <= index < length:
+            for levels in self._levels:
+                if index < len(levels):
+                    return levels[index]
+                index -= len(levels)
+        raise IndexError('list index out of range')
+
+    def __contains__(self, level):
+        return any(stored is level or stored == level for stored in self)
+
+    def __add__(self, other):
+        return self[:] + other
+
+    def __mul__(self, count):
+        return self[:] * count
+
+    __rmul__ = __mul__
+
+    def copy(self):
+        return self[:]
+
+    def count(self, level):
+        return sum(1 for stored in self if stored is level or stored == level)
+
+    def index(self, level, start=0, stop=sys.maxsize):
+        return self[:].index(level, start, stop)
+
+    def not_supported(self, *args, **kwargs):
+        raise NotSupported(type(self).__name__ + ' keeps its levels in chunks, use store() to change them')
+
+    append = insert = extend = sort = pop = remove = reverse = not_supported
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = not_supported
+
+# -----------------------------------------------------------------------------
+# the tree-backed variant of CountedOrderBookSide
+
+
+class TreeCountedOrderBookSide(TreeOrderBookSide):
+    columns = 3
+
+    def storeArray(self, delta):
+        if self.strings:
+            self.parse_strings(delta)
+        price = delta[0]
+        size = delta[1]
+        count = delta[2]
+        key = price if self.tick is None else round(price / self.tick)
+        index_price = -key if self.side else key
+        if size and count:
+            level = self._insert(index_price, delta)
+            if level is not delta:
+                if self.views:
+                    self.notify(level[0], size, 0, level[1])
+                level[1] = size
+                level[2] = count
+            elif self.views:
+                self.notify(price, size, 1)
+        else:
+            level = self._delete(index_price)
+            if level is not None and self.views:
+                self.notify(level[0], -level[1], -1)
+
+    def store(self, price, size, count):
+        self.storeArray([price, size, count])
+
+    def is_live(self, delta):
+        return delta[1] and delta[2]
+
+    def update_level(self, level, delta):
+        level[1] = delta[1]
+        level[2] = delta[2]
+
+# -----------------------------------------------------------------------------
+# the levels of another side grouped by a price step, see OrderBook.aggregated()
+# the side that is followed reports every change of a level or an order through add()
+# so the groups are updated in place instead of being summed up again on every read
+# bids are grouped down and asks are grouped up to the nearest multiple of the step
+
+
+class AggregatedOrderBookSide(OrderBookSide):
+    def __init__(self, step=None, depth=None):
+        self.step = step
+        self.price_tick = None  # the tick of the side that is followed, see set_price_tick()
+        self._counts = {}  # levels or orders in every group
+        self._sums = {}  # the exact sizes of the groups, see add()
+        super(AggregatedOrderBookSide, self).__init__([], depth)
+
+    def set_price_tick(self, tick):
+        # only a step of whole ticks keeps the prices of the grid at least one tick away from the other multiples
+        whole = tick and self.step and Decimal(str(self.step)) % Decimal(str(tick)) == 0
+        self.price_tick = tick if whole else None
+
+    def group_key(self, price):
+        # price / step can land just below a multiple of the step, like 0.3 / 0.1 = 2.9999999999999996
+        # the prices on the grid of the tick are a tick away from the next multiple or on it, so half a tick is safe
+        # otherwise the quotient is off by a few units in the last place at most
+        quotient = price / self.step
+        if self.price_tick:
+            epsilon = self.price_tick / self.step / 2
+        else:
+            epsilon = abs(quotient) * 4 * sys.float_info.epsilon
+        return math.floor(quotient + epsilon) if self.side else math.ceil(quotient - epsilon)
+
+    def add(self, price, size, count, previous=0):
+        # the sizes are summed as decimals of their shortest repr, the wire values
+        # so a group is the exact sum of its levels however many updates it went through
+        change = Decimal(repr(float(size)))
+        if previous:
+            change -= Decimal(repr(float(previous)))
+        key = price if self.step is None else self.group_key(price)
+        index_key = -key if self.side else key
+        index = bisect.bisect_left(self._index, index_key)
+        if index < len(self._index) and self._index[index] == index_key:
+            count += self._counts[index_key]
+            if count > 0:
+                total = self._sums[index_key] + change
+                list.__getitem__(self, index)[1] = float(total)
+                self._sums[index_key] = total
+                self._counts[index_key] = count
+            else:
+                del self._index[index]
+                del self[index]
+                del self._counts[index_key]
+                del self._sums[index_key]
+        elif count > 0:
+            group_price = price if self.step is None else float(Decimal(key) * Decimal(str(self.step)))
+            self._index.insert(index, index_key)
+            self.insert(index, [group_price, float(change)])
+            self._counts[index_key] = count
+            self._sums[index_key] = change
+
+    def clear(self):
+        self._counts.clear()
+        self._sums.clear()
+        super(AggregatedOrderBookSide, self).clear()
+
 # -----------------------------------------------------------------------------
 # a more elegant syntax is possible here, but native inheritance is portable
 
@@ -172,3 +753,9 @@ class CountedAsks(CountedOrderBookSide): side = False                       # no
 class CountedBids(CountedOrderBookSide): side = True                        # noqa
 class IndexedAsks(IndexedOrderBookSide): side = False                       # noqa
 class IndexedBids(IndexedOrderBookSide): side = True                        # noqa
+class TreeAsks(TreeOrderBookSide): side = False                             # noqa
+class TreeBids(TreeOrderBookSide): side = True                              # noqa
+class TreeCountedAsks(TreeCountedOrderBookSide): side = False               # noqa
+class TreeCountedBids(TreeCountedOrderBookSide): side = True                # noqa
+class AggregatedAsks(AggregatedOrderBookSide): side = False                 # noqa
+class AggregatedBids(AggregatedOrderBookSide): side = True                  # noqa
@@ -33,6 +33,7 @@ from ccxt.base.decimal_to_precision import decimal_to_precision
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE, NO_PADDING, TRUNCATE, ROUND, ROUND_UP, ROUND_DOWN, SIGNIFICANT_DIGITS
 from ccxt.base.decimal_to_precision import number_to_string
 from ccxt.base.precise import Precise
+from ccxt.base.throttler import Throttler
 from ccxt.base.types import ConstructorArgs, BalanceAccount, Currency, IndexType, OrderSide, OrderType, Trade, OrderRequest, Market, MarketType, Str, Num, Strings, CancellationRequest, Bool
 
 # -----------------------------------------------------------------------------
@@ -107,14 +108,17 @@ import random
 from numbers import Number
 import re
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.utils import default_user_agent
 from requests.exceptions import HTTPError, Timeout, TooManyRedirects, RequestException, ConnectionError as requestsConnectionError
 # import socket
 from ssl import SSLError
 # import sys
+import threading
 import time
 import uuid
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from time import mktime
 from wsgiref.handlers import format_date_time
@@ -153,6 +157,9 @@ class Exchange(object):
     aiohttp_trust_env = False
     requests_trust_env = False
     session = None  # Session () by default
+    executor = None  # the ThreadPoolExecutor of fetch_many(), with options['threads']
+    thread_sessions = None  # the Session of every worker thread
+    worker_sessions = None  # the same sessions, closed by close()
     tcp_connector = None  # aiohttp.TCPConnector
     aiohttp_socks_connector = None
     socks_proxy_sessions = None
@@ -195,6 +202,7 @@ class Exchange(object):
     api = None
     parseJsonResponse = True
     throttler = None
+    throttler_rate_limit = None  # the rateLimit the refill rate of the throttler follows
 
     # PROXY & USER-AGENTS (see "examples/proxy-usage" file for explanation)
     proxy = None  # for backwards compatibility
@@ -437,8 +445,10 @@ class Exchange(object):
                         setattr(self, camelcase, attr)
 
         if not self.session and self.synchronous:
-            self.session = Session()
-            self.session.trust_env = self.requests_trust_env
+            self.session = self.create_session()
+        if self.safe_integer(self.options, 'threads', 1) > 1:
+            # paginate: True goes through the generated version, which makes the calls one after another
+            self.fetch_paginated_call_deterministic = self.fetch_paginated_call_threads
         self.logger = self.logger if self.logger else logging.getLogger(__name__)
 
     def __del__(self):
@@ -447,6 +457,103 @@ class Exchange(object):
                 self.session.close()
             except Exception as e:
                 pass
+        if self.executor:
+            self.executor.shutdown(wait=False)
+
+    def close(self):
+        # stops the worker threads of fetch_many() and closes the sessions and their connections
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+        for session in self.worker_sessions or []:
+            session.close()
+        self.thread_sessions = None
+        self.worker_sessions = None
+        if self.session:
+            self.session.close()
+
+    def create_session(self):
+        # options['http'] tunes the connection pools of the session
+        #
+        #     poolConnections  the number of hosts with a pool, 10 by default
+        #     poolMaxsize      the connections kept open per host, 10 by default
+        #     poolBlock        wait for a free connection instead of opening one that is not kept
+        #     maxRetries       retries of failed connections, not of requests that reached the server
+        #     keepAlive        False closes the connection after every request
+        #     adapter          a transport adapter instance mounted for https://, for example one that speaks http/2
+        #
+        session = Session()
+        session.trust_env = self.requests_trust_env
+        config = self.safe_dict(self.options, 'http', {})
+        if config:
+            adapter = self.safe_value(config, 'adapter')
+            if adapter is None:
+                adapter = HTTPAdapter(
+                    pool_connections=self.safe_integer(config, 'poolConnections', 10),
+                    pool_maxsize=self.safe_integer(config, 'poolMaxsize', 10),
+                    max_retries=self.safe_integer(config, 'maxRetries', 0),
+                    pool_block=self.safe_bool(config, 'poolBlock', False),
+                )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            if not self.safe_bool(config, 'keepAlive', True):
+                session.headers['Connection'] = 'close'
+        return session
+
+    def get_session(self):
+        # requests.Session is not thread-safe, the worker threads of fetch_many() use their own
+        session = getattr(self.thread_sessions, 'session', None) if self.thread_sessions else None
+        return session or self.session
+
+    def init_worker_thread(self):
+        # a copy of the session of the exchange, which may be one the user configured
+        # the mounted adapters are shared, their connection pools are thread-safe
+        session = Session()
+        for name in ['headers', 'auth', 'proxies', 'hooks', 'params', 'stream', 'verify', 'cert', 'max_redirects', 'trust_env', 'adapters']:
+            value = getattr(self.session, name)
+            setattr(session, name, value.copy() if hasattr(value, 'copy') else value)
+        self.thread_sessions.session = session
+        self.worker_sessions.append(session)
+
+    def fetch_many(self, method, args_list):
+        # calls method with every list of arguments and returns the results in the same order
+        # with options['threads'] above 1 the calls run on a pool of threads that share the rate limiter
+        threads = self.safe_integer(self.options, 'threads', 1)
+        method = getattr(self, method)
+        if threads <= 1 or len(args_list) <= 1:
+            return [method(*args) for args in args_list]
+        if self.executor is None:
+            self.thread_sessions = threading.local()
+            self.worker_sessions = []
+            self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix=self.id, initializer=self.init_worker_thread)
+        return list(self.executor.map(lambda args: method(*args), args_list))
+
+    def fetch_paginated_call_threads(self, method: str, symbol: Str = None, since: Int = None, limit: Int = None, timeframe: Str = None, params={}, maxEntriesPerRequest=None):
+        # fetch_paginated_call_deterministic() with the calls on the threads of fetch_many()
+        # the generated version makes every call before the next one, the transpiler cannot defer them
+        # it replaces the generated version when options['threads'] is above 1 in the constructor
+        maxCalls, params = self.handle_option_and_params(params, method, 'paginationCalls', 10)
+        maxEntriesPerRequest, params = self.handle_max_entries_per_request_and_params(method, maxEntriesPerRequest, params)
+        current = self.milliseconds()
+        step = self.parse_timeframe(timeframe) * 1000 * maxEntriesPerRequest
+        currentSince = current - (maxCalls * step) - 1
+        currentSince = max(currentSince, since if since is not None else 1241440531000)  # avoid timestamps older than 2009
+        until = self.safe_integer_2(params, 'until', 'till')
+        if until is not None:
+            requiredCalls = int(math.ceil((until - currentSince) / step))
+            if requiredCalls > maxCalls:
+                raise BadRequest(self.id + ' the number of required calls is greater than the max number of calls allowed, either increase the paginationCalls or decrease the since-until gap. Current paginationCalls limit is ' + str(maxCalls) + ' required calls is ' + str(requiredCalls))
+        tasks = []
+        for i in range(0, maxCalls):
+            if ((until is not None) and (currentSince >= until)) or (currentSince >= current):
+                break
+            tasks.append([method, symbol, currentSince, maxEntriesPerRequest, timeframe, params])
+            currentSince = self.sum(currentSince, step) - 1
+        result = []
+        for results in self.fetch_many('safe_deterministic_call', tasks):
+            result = self.array_concat(result, results)
+        key = 0 if (method == 'fetchOHLCV') else 'timestamp'
+        return self.filter_by_since_limit(self.remove_repeated_elements_from_array(result), since, limit, key)
 
     def __repr__(self):
         return 'ccxt.' + ('async_support.' if self.asyncio_loop else '') + self.id + '()'
@@ -455,17 +562,16 @@ class Exchange(object):
         return self.name
 
     def init_throttler(self, cost=None):
-        # stub in sync
-        pass
+        self.throttler = Throttler(self.tokenBucket)
+        self.throttler_rate_limit = self.rateLimit
 
     def throttle(self, cost=None):
-        now = float(self.milliseconds())
-        elapsed = now - self.lastRestRequestTimestamp
-        cost = 1 if cost is None else cost
-        sleep_time = self.rateLimit * cost
-        if elapsed < sleep_time:
-            delay = sleep_time - elapsed
-            time.sleep(delay / 1000.0)
+        # blocks the calling thread until the token bucket allows the cost, thread-safe
+        if self.rateLimit != self.throttler_rate_limit:
+            # rateLimit was changed after the construction, the refill rate follows like in init_rest_rate_limiter()
+            self.throttler_rate_limit = self.rateLimit
+            self.throttler.config['refillRate'] = 1 / self.rateLimit if self.rateLimit > 0 else self.MAX_VALUE
+        return self.throttler(cost)
 
     @staticmethod
     def gzip_deflate(response, text):
@@ -546,14 +652,16 @@ class Exchange(object):
         if body:
             body = body.encode()
 
-        self.session.cookies.clear()
+        session = self.get_session()
+        if session.cookies:
+            session.cookies.clear()
 
         http_response = None
         http_status_code = None
         http_status_text = None
         json_response = None
         try:
-            response = self.session.request(
+            response = session.request(
                 method,
                 url,
                 data=body,
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from ccxt.base.errors import NotSupported
+
+# -----------------------------------------------------------------------------
+# token buckets shared by several throttlers, set one as tokenBucket['backend']
+# and give the instances that draw from the same budget the same tokenBucket['key']
+#
+#     backend = FileRateLimiterBackend('/tmp/ccxt-binance.json')
+#     exchange = ccxt.binance({
+#         'apiKey': apiKey,
+#         'tokenBucket': {'backend': backend, 'key': apiKey},
+#     })
+#
+# the bucket settings (refillRate, capacity, tokens) stay in the config of every throttler
+# the backend only keeps the tokens and the time of the last refill of every bucket
+# the async Throttler calls the backend in the default executor of the loop, so a backend may block
+
+# the settings of a bucket from tokenBucket['buckets'] that it does not set itself
+bucket_defaults = {
+    'refillRate': 1.0,
+    'tokens': 0,
+    'capacity': 1.0,
+}
+
+
+def refill(state, name, bucket, now):
+    # state is {name: [tokens, timestamp]}, returns the tokens of the bucket after the refill
+    tokens, timestamp = state.get(name) or (bucket['tokens'], now)
+    tokens = min(tokens + (now - timestamp) * bucket['refillRate'], bucket['capacity'])
+    state[name] = [tokens, now]
+    return tokens
+
+
+def spend(state, costs, buckets, now):
+    # refills the buckets of the costs and spends from all of them or none
+    waits = {}
+    for name in costs:
+        bucket = buckets[name]
+        tokens = refill(state, name, bucket, now)
+        if tokens < 0:
+            waits[name] = -tokens / bucket['refillRate'] if bucket['refillRate'] > 0 else 0
+    if not waits:
+        for name, cost in costs.items():
+            state[name][0] -= cost
+    return waits
+
+
+def limit(state, name, tokens, buckets, now):
+    # lowers the tokens of a bucket to the usage an exchange reported
+    state[name][0] = min(refill(state, name, buckets[name], now), tokens)
+
+
+class RateLimiterBackend(object):
+    """The interface of a store of token buckets that several throttlers draw from"""
+
+    def acquire(self, key, costs, buckets):
+        # spends costs {name: cost} from the buckets stored under key if none of them is short
+        # otherwise spends nothing and returns the ms every short bucket needs to refill, {name: wait}
+        raise NotImplementedError(self.__class__.__name__ + '.acquire() is not implemented')
+
+    def limit(self, key, name, tokens, buckets):
+        # lowers the tokens of the bucket name stored under key to tokens, see Throttler.update_usage()
+        raise NotImplementedError(self.__class__.__name__ + '.limit() is not implemented')
+
+
+class MemoryRateLimiterBackend(RateLimiterBackend):
+    """Buckets shared by the exchange instances and threads of one process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.states = {}
+
+    def acquire(self, key, costs, buckets):
+        with self.lock:
+            state = self.states.setdefault(key, {})
+            return spend(state, costs, buckets, time.time() * 1000)
+
+    def limit(self, key, name, tokens, buckets):
+        with self.lock:
+            limit(self.states.setdefault(key, {}), name, tokens, buckets, time.time() * 1000)
+
+
+class FileRateLimiterBackend(RateLimiterBackend):
+    """Buckets shared by the processes of one host through a locked json file"""
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise NotSupported('FileRateLimiterBackend requires fcntl, which is not available on this platform')
+        self.path = path
+
+    def update(self, key, function):
+        # calls function with the state stored under key while the file is locked and writes the state back
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            with os.fdopen(os.dup(fd), 'r+') as file:
+                content = file.read()
+                states = json.loads(content) if content else {}
+                result = function(states.setdefault(key, {}), time.time() * 1000)
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(states))
+            return result
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def acquire(self, key, costs, buckets):
+        return self.update(key, lambda state, now: spend(state, costs, buckets, now))
+
+    def limit(self, key, name, tokens, buckets):
+        self.update(key, lambda state, now: limit(state, name, tokens, buckets, now))
+
+
+class RedisRateLimiterBackend(RateLimiterBackend):
+    """Buckets shared by the processes of many hosts, client is any object with the eval() method of redis-py"""
+
+    # the same steps as spend(), atomically and with the clock of the server
+    script = '''
+local time = redis.call('TIME')
+local now = time[1] * 1000 + time[2] / 1000
+local states = {}
+local waits = {}
+local short = false
+for i, key in ipairs(KEYS) do
+    local offset = (i - 1) * 4
+    local rate = tonumber(ARGV[offset + 2])
+    local state = redis.call('HMGET', key, 'tokens', 'timestamp')
+    local tokens = tonumber(state[1]) or tonumber(ARGV[offset + 4])
+    local timestamp = tonumber(state[2]) or now
+    tokens = math.min(tokens + (now - timestamp) * rate, tonumber(ARGV[offset + 3]))
+    states[i] = tokens
+    waits[i] = ''
+    if tokens < 0 then
+        short = true
+        waits[i] = tostring(rate > 0 and -tokens / rate or 0)
+    end
+end
+for i, key in ipairs(KEYS) do
+    local tokens = states[i]
+    if not short then
+        tokens = tokens - tonumber(ARGV[(i - 1) * 4 + 1])
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'timestamp', tostring(now))
+    redis.call('PEXPIRE', key, ARGV[#ARGV])
+end
+return waits
+'''
+
+    # the same steps as limit()
+    limit_script = '''
+local time = redis.call('TIME')
+local now = time[1] * 1000 + time[2] / 1000
+local rate = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'timestamp')
+local tokens = tonumber(state[1]) or tonumber(ARGV[3])
+local timestamp = tonumber(state[2]) or now
+tokens = math.min(tokens + (now - timestamp) * rate, tonumber(ARGV[2]), tonumber(ARGV[4]))
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'timestamp', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[5])
+return ''
+'''
+
+    def __init__(self, client, prefix='ccxt:throttle:', expiry=3600000):
+        self.client = client
+        self.prefix = prefix
+        self.expiry = expiry  # ms after which an unused bucket is dropped
+
+    def acquire(self, key, costs, buckets):
+        names = list(costs)
+        keys = [self.prefix + key + ':' + name for name in names]
+        args = []
+        for name in names:
+            bucket = buckets[name]
+            args += [costs[name], bucket['refillRate'], bucket['capacity'], bucket['tokens']]
+        args.append(self.expiry)
+        waits = self.client.eval(self.script, len(keys), *keys, *args)
+        result = {}
+        for name, wait in zip(names, waits):
+            if isinstance(wait, bytes):
+                wait = wait.decode()
+            if wait != '':
+                result[name] = float(wait)
+        return result
+
+    def limit(self, key, name, tokens, buckets):
+        bucket = buckets[name]
+        self.client.eval(self.limit_script, 1, self.prefix + key + ':' + name, bucket['refillRate'], bucket['capacity'], bucket['tokens'], tokens, self.expiry)
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from ccxt.base.rate_limiter import bucket_defaults, spend
+
+
+# the token bucket of the synchronous exchange, configured by the same tokenBucket as the async Throttler
+# the calling thread sleeps until the buckets it spends from have refilled, threads share the tokens
+
+
+class Throttler(object):
+    def __init__(self, config):
+        self.config = {
+            'refillRate': 1.0,
+            'delay': 0.001,
+            'cost': 1.0,
+            'tokens': 0,
+            'capacity': 1.0,
+            'backend': None,  # a RateLimiterBackend from ccxt.base.rate_limiter that keeps the tokens instead
+            'key': 'default',
+        }
+        self.config.update(config)
+        self.buckets = {
+            'default': self.config,
+        }
+        for name, bucket in self.config.get('buckets', {}).items():
+            self.buckets[name] = dict(bucket_defaults, **bucket)
+        self.lock = threading.Lock()
+        self.state = {}  # the tokens and the time of the last refill of every bucket, see spend()
+
+    def acquire(self, costs):
+        # spends the costs and returns {} or spends nothing and returns the ms every short bucket needs
+        if self.config['backend'] is not None:
+            return self.config['backend'].acquire(self.config['key'], costs, self.buckets)
+        with self.lock:
+            return spend(self.state, costs, self.buckets, time.time() * 1000)
+
+    def __call__(self, cost=None):
+        if isinstance(cost, dict):
+            for name in cost:
+                if name not in self.buckets:
+                    raise ValueError('unknown throttle bucket ' + str(name) + ', configure it in tokenBucket["buckets"]')
+            costs = cost
+        else:
+            costs = {'default': self.config['cost'] if cost is None else cost}
+        while True:
+            waits = self.acquire(costs)
+            if not waits:
+                return
+            # after the longest wait all the buckets have refilled, unless other threads spent the tokens first
+            time.sleep(max(max(waits.values()) / 1000, self.config['delay']))
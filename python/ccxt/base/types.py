@@ -1,5 +1,6 @@
 import sys
 import types
+import contextvars
 from typing import Union, List, Optional, Any as PythonAny
 from decimal import Decimal
 
@@ -23,6 +24,18 @@ PositionSide = Literal['long', 'short']
 Any = PythonAny
 
 
+# the rate limiter lane of the current call, see Entry and Throttler
+rate_limit_priority = contextvars.ContextVar('rate_limit_priority', default=None)
+
+
+async def with_rate_limit_priority(priority, coroutine):
+    token = rate_limit_priority.set(priority)
+    try:
+        return await coroutine
+    finally:
+        rate_limit_priority.reset(token)
+
+
 class Entry:
     def __init__(self, path, api, method, config):
         self.name = None
@@ -32,7 +45,16 @@ class Entry:
         self.config = config
 
         def unbound_method(_self, params={}):
-            return _self.request(self.path, self.api, self.method, params, config=self.config)
+            # the priority comes from params['rateLimitPriority'] or from the config of the endpoint
+            # no endpoint declares one, a call opts into a lane with create_order(..., {'rateLimitPriority': 'trading'})
+            # only the async throttler has lanes, the sync throttle() drops the priority
+            priority = self.config.get('priority')
+            if 'rateLimitPriority' in params:
+                priority = params['rateLimitPriority']
+                params = {key: value for key, value in params.items() if key != 'rateLimitPriority'}
+            if priority is None or _self.synchronous:
+                return _self.request(self.path, self.api, self.method, params, config=self.config)
+            return with_rate_limit_priority(priority, _self.request(self.path, self.api, self.method, params, config=self.config))
 
         self.unbound_method = unbound_method
 
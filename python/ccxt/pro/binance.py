@@ -158,6 +158,8 @@ class binance(ccxt.async_support.binance):
                 'listenKeyRefreshRate': 1200000,  # 20 mins
                 'ws': {
                     'cost': 5,
+                    'orderBookDeletes': True,  # the depth stream deletes every level it drops, see orderBookDepthView
+                    'maxSubscriptionsPerConnection': 1024,
                 },
                 'tickerChannelsMap': {
                     '24hrTicker': 'ticker',
@@ -60,6 +60,9 @@ class bitget(ccxt.async_support.bitget):
             },
             'options': {
                 'tradesLimit': 1000,
+                'ws': {
+                    'maxSubscriptionsPerConnection': 1000,
+                },
                 'OHLCVLimit': 1000,
                 # WS timeframes differ from REST timeframes
                 'timeframes': {
@@ -0,0 +1,110 @@
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.order_book import IndexedOrderBook  # noqa: E402
+
+
+def assert_consistent(side):
+    # the index, the levels and the handles describe the same orders
+    levels = list(side)
+    assert [(side.index_key(level[0]), level[2]) for level in levels] == side._index
+    assert sorted(side._hashmap) == sorted(level[2] for level in levels)
+    for level in levels:
+        assert side._hashmap[level[2]] is level or side._hashmap[level[2]] == level
+
+
+def test_indexed_update_in_place():
+    orderbook = IndexedOrderBook({'bids': [[10, 1, 'a'], [10, 2, 'b'], [9, 3, 'c']], 'asks': []})
+    bids = orderbook['bids']
+    handle = bids._hashmap['b']
+    bids.store(10, 5, 'b')
+    # the stored level of the order is updated, nothing moves
+    assert bids._hashmap['b'] is handle and handle == [10, 5, 'b']
+    assert bids == [[10, 1, 'a'], [10, 5, 'b'], [9, 3, 'c']]
+    # an update without a price keeps the price of the order
+    bids.store(None, 7, 'c')
+    assert bids == [[10, 1, 'a'], [10, 5, 'b'], [9, 7, 'c']]
+    assert_consistent(bids)
+
+
+def test_indexed_delete():
+    orderbook = IndexedOrderBook({'bids': [], 'asks': [[11, 1, 'a'], [11, 2, 'b'], [12, 3, 'c']]})
+    asks = orderbook['asks']
+    asks.store(11, 0, 'a')
+    assert asks == [[11, 2, 'b'], [12, 3, 'c']] and 'a' not in asks._hashmap
+    # a delete without a price finds the order by its id
+    asks.store(None, 0, 'c')
+    assert asks == [[11, 2, 'b']] and 'c' not in asks._hashmap
+    # an unknown id changes nothing
+    asks.store(13, 0, 'd')
+    assert asks == [[11, 2, 'b']]
+    assert_consistent(asks)
+
+
+def test_indexed_move_price():
+    orderbook = IndexedOrderBook({'bids': [[10, 1, 'a'], [10, 2, 'b'], [9, 3, 'c']], 'asks': []})
+    bids = orderbook['bids']
+    bids.store(8, 2, 'b')
+    assert bids == [[10, 1, 'a'], [9, 3, 'c'], [8, 2, 'b']]
+    assert bids._hashmap['b'][0] == 8
+    # the orders of one price are ordered by id
+    bids.store(9, 4, 'a')
+    assert bids == [[9, 4, 'a'], [9, 3, 'c'], [8, 2, 'b']]
+    assert_consistent(bids)
+
+
+def test_indexed_limit():
+    orderbook = IndexedOrderBook({'bids': [[10, 1, 'a'], [9, 2, 'b'], [8, 3, 'c'], [7, 4, 'd']], 'asks': []}, 2)
+    bids = orderbook['bids']
+    view = orderbook.aggregated()['bids']
+    orderbook.limit()
+    # the trimmed orders lose their handles and leave the aggregated view
+    assert bids == [[10, 1, 'a'], [9, 2, 'b']]
+    assert sorted(bids._hashmap) == ['a', 'b']
+    assert view == [[10, 1], [9, 2]]
+    # a trimmed order that comes back is a new order
+    bids.store(None, 5, 'c')
+    assert bids == [[10, 1, 'a'], [9, 2, 'b']]
+    bids.store(9.5, 5, 'c')
+    orderbook.limit()
+    assert bids == [[10, 1, 'a'], [9.5, 5, 'c']] and sorted(bids._hashmap) == ['a', 'c']
+    assert view == [[10, 1], [9.5, 5]]
+    assert_consistent(bids)
+
+
+def test_indexed_matches_reference():
+    generator = random.Random(4)
+    orderbook = IndexedOrderBook({}, 20)
+    bids = orderbook['bids']
+    orders = {}
+    for i in range(5000):
+        order_id = 'id' + str(generator.randint(1, 60))
+        price = generator.randint(1, 15)
+        size = generator.choice([0, generator.randint(1, 9)])
+        if order_id in orders and generator.random() < 0.3:
+            bids.store(None, size, order_id)
+            price = orders[order_id][0]
+        else:
+            bids.store(price, size, order_id)
+        if size:
+            orders[order_id] = [price, size, order_id]
+        else:
+            orders.pop(order_id, None)
+        if i % 100 == 99:
+            orderbook.limit()
+            expected = sorted(orders.values(), key=lambda order: (-order[0], order[2]))[:20]
+            orders = {order[2]: order for order in expected}
+            assert bids == expected
+            assert_consistent(bids)
+
+
+def test_ws_indexed_order_book():
+    test_indexed_update_in_place()
+    test_indexed_delete()
+    test_indexed_move_price()
+    test_indexed_limit()
+    test_indexed_matches_reference()
@@ -0,0 +1,102 @@
+import math
+import os
+import random
+import sys
+from decimal import Decimal
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.order_book import OrderBook, CountedOrderBook, IndexedOrderBook, TreeOrderBook  # noqa: E402
+
+
+def grouped(bookside, tick, bids):
+    # sums the levels from scratch
+    groups = {}
+    for level in bookside:
+        if tick is None:
+            key = level[0]
+        else:
+            key = math.floor(level[0] / tick + 1e-9) if bids else math.ceil(level[0] / tick - 1e-9)
+        groups[key] = groups.get(key, 0) + level[1]
+    return sorted(groups.items(), reverse=bids)
+
+
+def assert_grouped(view, bookside, tick, bids):
+    expected = grouped(bookside, tick, bids)
+    assert len(view) == len(expected)
+    for level, (key, size) in zip(view, expected):
+        assert math.isclose(level[0], key if tick is None else key * tick)
+        assert math.isclose(level[1], size, abs_tol=1e-9)
+
+
+def test_aggregated_follows_updates():
+    generator = random.Random(10)
+    for book_class, third in [(OrderBook, None), (TreeOrderBook, None), (CountedOrderBook, 'count'), (IndexedOrderBook, 'id')]:
+        for depth in [None, 30]:
+            orderbook = book_class({}, depth)
+            for tick in [None, 0.5, 2]:
+                orderbook.aggregated(tick)
+            for i in range(3000):
+                side = 'bids' if i % 2 else 'asks'
+                delta = [generator.randint(1, 400) / 10, generator.choice([0, generator.randint(1, 9)])]
+                if third == 'count':
+                    delta.append(generator.randint(0 if delta[1] else 1, 3))
+                elif third == 'id':
+                    delta.append(generator.randint(1, 200))
+                    if delta[2] in orderbook[side]._hashmap and generator.random() < 0.3:
+                        delta[0] = None
+                orderbook[side].storeArray(delta)
+                if i % 250 == 0:
+                    orderbook.limit()
+                if i % 1000 == 999:
+                    orderbook.reset({'bids': [[10.0, 1] + ([] if third is None else [1])]})
+            orderbook.limit()
+            for tick in [None, 0.5, 2]:
+                view = orderbook.aggregated(tick)
+                assert_grouped(view['bids'], orderbook['bids'], tick, True)
+                assert_grouped(view['asks'], orderbook['asks'], tick, False)
+
+
+def test_aggregated_groups():
+    orderbook = OrderBook({'bids': [[100.2, 1], [100.0, 2], [99.6, 3]], 'asks': [[100.4, 1], [100.6, 2]], 'nonce': 7})
+    view = orderbook.aggregated(0.5)
+    assert view['bids'] == [[100.0, 3], [99.5, 3]]
+    assert view['asks'] == [[100.5, 1], [101.0, 2]]
+    assert view['nonce'] == 7
+    orderbook['bids'].store(100.0, 0)
+    orderbook['asks'].store_many([100.3, 100.4], [4, 0])
+    assert view['bids'] == [[100.0, 1], [99.5, 3]]
+    assert view['asks'] == [[100.5, 4], [101.0, 2]]
+    assert orderbook.aggregated(0.5) is view
+
+
+def test_aggregated_sizes_are_exact():
+    generator = random.Random(3)
+    orderbook = OrderBook()
+    view = orderbook.aggregated(1)
+    for _ in range(2000):
+        orderbook['bids'].store(generator.randint(90, 109) / 10, generator.randint(0, 30) / 10)
+    # the groups are the sums of the levels from scratch, to the last bit
+    groups = {}
+    for price, size in orderbook['bids']:
+        groups[math.floor(price)] = groups.get(math.floor(price), Decimal(0)) + Decimal(repr(size))
+    assert view['bids'] == [[float(key), float(size)] for key, size in sorted(groups.items(), reverse=True)]
+
+
+def test_aggregated_group_boundaries():
+    # 0.3 / 0.1 is 2.9999999999999996
+    orderbook = OrderBook({'bids': [[0.3, 1], [0.29, 1]], 'asks': [[0.7, 1], [0.71, 1]]})
+    view = orderbook.aggregated(0.1)
+    assert view['bids'] == [[0.3, 1], [0.2, 1]] and view['asks'] == [[0.7, 1], [0.8, 1]]
+    # on the grid of a tick, half a tick separates the groups
+    orderbook.set_tick_size(0.01)
+    assert view['bids'] == [[0.3, 1], [0.2, 1]] and view['asks'] == [[0.7, 1], [0.8, 1]]
+    assert view['bids'].price_tick == 0.01 and orderbook.aggregated(0.015)['bids'].price_tick is None
+
+
+def test_ws_order_book_aggregated():
+    test_aggregated_follows_updates()
+    test_aggregated_groups()
+    test_aggregated_sizes_are_exact()
+    test_aggregated_group_boundaries()
@@ -0,0 +1,56 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt import NotSupported  # noqa: E402
+from ccxt.async_support.base.ws import order_book_side  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, CountedOrderBook, IndexedOrderBook, TreeOrderBook  # noqa: E402
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def test_order_book_to_numpy():
+    snapshot = {
+        'bids': [[10, 1], [9.5, 2], [9, 3]],
+        'asks': [[11, 4], [12, 5]],
+    }
+    for book in [OrderBook(snapshot), TreeOrderBook(snapshot)]:
+        if numpy is None:
+            try:
+                book.to_numpy()
+                assert False
+            except NotSupported:
+                return
+        arrays = book.to_numpy()
+        assert arrays['bids'].shape == (3, 2)
+        assert arrays['bids'].tolist() == [[10, 1], [9.5, 2], [9, 3]]
+        assert arrays['asks'].tolist() == [[11, 4], [12, 5]]
+        assert book.to_numpy(1)['bids'].tolist() == [[10, 1]]
+        assert book.to_numpy(10)['asks'].shape == (2, 2)
+        assert OrderBook().to_numpy()['bids'].shape == (0, 2)
+
+
+def test_counted_and_indexed_order_book_to_numpy():
+    if numpy is None:
+        return
+    counted = CountedOrderBook({'bids': [[10, 1, 2]], 'asks': [[11, 3, 4]]})
+    assert counted.to_numpy()['asks'].tolist() == [[11, 3, 4]]
+    indexed = IndexedOrderBook({'bids': [[10, 1, 'a'], [10, 2, 'b']], 'asks': []})
+    # order ids are not numeric and are left out
+    assert indexed.to_numpy()['bids'].tolist() == [[10, 1], [10, 2]]
+
+
+def test_order_book_side_imports_numpy_lazily():
+    # the order books do not load numpy until an array is exported
+    assert not hasattr(order_book_side, 'numpy')
+
+
+def test_ws_order_book_array():
+    test_order_book_to_numpy()
+    test_counted_and_indexed_order_book_to_numpy()
+    test_order_book_side_imports_numpy_lazily()
@@ -0,0 +1,95 @@
+import binascii
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+import ccxt.pro  # noqa: E402
+from ccxt.base.decimal_to_precision import number_to_string  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, CountedOrderBook  # noqa: E402
+from ccxt.async_support.base.ws.order_book_checksum import OrderBookChecksum, checksum_formats  # noqa: E402
+
+
+def signed_crc32(payload):
+    unsigned = binascii.crc32(payload.encode('utf8'))
+    return unsigned - 0x100000000 if unsigned >= 0x80000000 else unsigned
+
+
+def okx_reference(orderbook):
+    # the payload built by pro/okx.py handle_order_book_message
+    bids = orderbook['bids']
+    asks = orderbook['asks']
+    payload = []
+    for i in range(0, 25):
+        if i < len(bids):
+            payload.append(number_to_string(bids[i][0]))
+            payload.append(number_to_string(bids[i][1]))
+        if i < len(asks):
+            payload.append(number_to_string(asks[i][0]))
+            payload.append(number_to_string(asks[i][1]))
+    return signed_crc32(':'.join(payload))
+
+
+def test_okx_checksum_matches_reference():
+    generator = random.Random(3)
+    orderbook = OrderBook()
+    checksum = OrderBookChecksum(checksum_formats['okx'])
+    for i in range(3000):
+        price = generator.randint(1, 400) / 100
+        size = generator.choice([0, round(generator.random(), 8)])
+        orderbook['bids' if price < 2 else 'asks'].store(price, size)
+        if i % 10 == 0:
+            assert checksum(orderbook) == okx_reference(orderbook)
+
+
+def test_raw_and_negated_checksums():
+    bitget = CountedOrderBook()
+    bitget['bids'].store(10.5, 1.0, ['10.50', '1.000'])
+    bitget['asks'].store(11, 2.0, ['11.00', '2.000'])
+    assert OrderBookChecksum(checksum_formats['bitget'])(bitget) == signed_crc32('10.50:1.000:11.00:2.000')
+    bitfinex = OrderBook({'bids': [[10, 1.5]], 'asks': [[11, 2]]})
+    assert OrderBookChecksum(checksum_formats['bitfinex'])(bitfinex) == signed_crc32('10:1.5:11:-2')
+
+
+def test_kraken_checksum_pads_to_the_market():
+    # the book of the checksum example in the kraken websocket documentation
+    # stored as numbers like pro/kraken.py stores them, the wire strings were 0.05005 and 0.00000500
+    asks = [[0.05005 + i * 0.00005, 0.000005] for i in range(10)]
+    bids = [[0.05 - i * 0.00005, 0.000005] for i in range(10)]
+    orderbook = OrderBook({'bids': bids, 'asks': asks})
+    checksum = OrderBookChecksum(checksum_formats['kraken'], (5, 8))
+    expected = '5005500' + '5010500' + '5015500' + '5020500' + '5025500' + '5030500' + '5035500' + '5040500' + '5045500' + '5050500'
+    expected += '5000500' + '4995500' + '4990500' + '4985500' + '4980500' + '4975500' + '4970500' + '4965500' + '4960500' + '4955500'
+    assert checksum.payload(orderbook) == expected
+    assert checksum(orderbook) == binascii.crc32(expected.encode('utf8'))
+    # without the precision of the market 0.05000 would be 5 instead of 5000
+    try:
+        OrderBookChecksum(checksum_formats['kraken'])(orderbook)
+        assert False
+    except ValueError:
+        pass
+    # the exchange reads the decimals from the precision of the market
+    exchange = ccxt.pro.kraken()
+    exchange.set_markets([{'id': 'XBTUSD', 'symbol': 'BTC/USD', 'base': 'BTC', 'quote': 'USD', 'baseId': 'XBT', 'quoteId': 'USD', 'type': 'spot', 'spot': True, 'precision': {'price': 0.00001, 'amount': 0.00000001}, 'limits': {}}])
+    orderbook['symbol'] = 'BTC/USD'
+    assert exchange.order_book_checksum(orderbook) == binascii.crc32(expected.encode('utf8'))
+
+
+def test_checksum_reuses_unchanged_levels():
+    orderbook = OrderBook({'bids': [[10, 1], [9, 1]], 'asks': [[11, 1]]})
+    checksum = OrderBookChecksum(checksum_formats['okx'])
+    checksum(orderbook)
+    cached = checksum._cache['bids'][9]
+    orderbook['bids'].store(10, 2)
+    assert checksum(orderbook) == okx_reference(orderbook)
+    assert checksum._cache['bids'][9] is cached
+    assert checksum._cache['bids'][10][0] == 2
+
+
+def test_ws_order_book_checksum():
+    test_okx_checksum_matches_reference()
+    test_raw_and_negated_checksums()
+    test_kraken_checksum_pads_to_the_market()
+    test_checksum_reuses_unchanged_levels()
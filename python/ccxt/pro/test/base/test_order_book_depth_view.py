@@ -0,0 +1,94 @@
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, TreeOrderBook  # noqa: E402
+from ccxt.base.errors import NotSupported  # noqa: E402
+import ccxt.pro  # noqa: E402
+
+
+def test_depth_view_matches_trimmed_book():
+    snapshot = {
+        'bids': [[10, 1], [9, 1], [8, 1], [7, 1], [6, 1]],
+        'asks': [[11, 1], [12, 1], [13, 1], [14, 1], [15, 1]],
+    }
+    for book_class in [OrderBook, TreeOrderBook]:
+        trimmed = book_class(snapshot, 3)
+        view = book_class(snapshot, 3).set_depth_view()
+        trimmed.limit()
+        view.limit()
+        assert view == trimmed
+        bids = view['bids']
+        assert len(bids) == 3
+        assert bids[-1] == [8, 1]
+        assert bids[1:] == [[9, 1], [8, 1]]
+        assert bids[::-1] == [[8, 1], [9, 1], [10, 1]]
+        assert list(reversed(bids)) == [[8, 1], [9, 1], [10, 1]]
+        try:
+            bids[3]
+            assert False
+        except IndexError:
+            pass
+        # the hidden levels are kept and come back when the top of the book is removed
+        bids.store(10, 0)
+        bids.store(9, 0)
+        trimmed['bids'].store(10, 0)
+        trimmed['bids'].store(9, 0)
+        view.limit()
+        trimmed.limit()
+        assert view['bids'] == [[8, 1], [7, 1], [6, 1]]
+        assert trimmed['bids'] == [[8, 1]]
+
+
+def test_depth_view_hides_levels_from_list_methods():
+    snapshot = {'bids': [[10, 1], [9, 1], [8, 1], [7, 1]], 'asks': []}
+    for book_class in [OrderBook, TreeOrderBook]:
+        view = book_class(snapshot, 2).set_depth_view()
+        view.limit()
+        bids = view['bids']
+        assert [9, 1] in bids and [8, 1] not in bids
+        assert bids.copy() == [[10, 1], [9, 1]] and bids + [] == [[10, 1], [9, 1]]
+        assert bids.count([8, 1]) == 0 and bids.index([9, 1]) == 1
+        try:
+            bids.index([7, 1])
+            assert False
+        except ValueError:
+            pass
+
+
+def test_depth_view_indexed_order_book():
+    view = IndexedOrderBook({'bids': [[10, 1, 'a'], [9, 1, 'b'], [8, 1, 'c']], 'asks': []}, 1).set_depth_view()
+    view.limit()
+    assert view['bids'] == [[10, 1, 'a']]
+    # updates of hidden orders still find them
+    view['bids'].store(8, 5, 'c')
+    view['bids'].store(10, 0, 'a')
+    view['bids'].store(9, 0, 'b')
+    assert view['bids'] == [[8, 5, 'c']]
+
+
+def test_depth_view_requires_deleting_feed():
+    async def run():
+        # binance deletes every level it drops
+        binance = ccxt.pro.binance({'options': {'ws': {'orderBookDepthView': True}}})
+        assert binance.order_book({}, 3)['bids'].view
+        await binance.close()
+        # kraken book-N only stays right if the book is truncated to the depth
+        kraken = ccxt.pro.kraken({'options': {'ws': {'orderBookDepthView': True}}})
+        try:
+            kraken.order_book({}, 10)
+            assert False
+        except NotSupported:
+            pass
+        await kraken.close()
+    asyncio.run(run())
+
+
+def test_ws_order_book_depth_view():
+    test_depth_view_matches_trimmed_book()
+    test_depth_view_hides_levels_from_list_methods()
+    test_depth_view_requires_deleting_feed()
+    test_depth_view_indexed_order_book()
@@ -0,0 +1,71 @@
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws import order_book_side  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, TreeCountedOrderBook  # noqa: E402
+
+
+def random_snapshot(generator, count, third):
+    levels = []
+    for i in range(count):
+        price = generator.randint(1, 300) / 10
+        size = generator.choice([0, generator.randint(1, 100)])
+        if third == 'count':
+            levels.append([price, size, generator.randint(0 if size else 1, 3)])
+        elif third == 'id':
+            levels.append([price, size, 'id' + str(generator.randint(1, count // 2))])
+        else:
+            levels.append([price, size])
+    if generator.random() < 0.5:
+        levels.sort(key=lambda level: level[0])
+    return levels
+
+
+def test_store_snapshot_matches_store_array():
+    generator = random.Random(8)
+    side_classes = [
+        (order_book_side.Asks, None),
+        (order_book_side.Bids, None),
+        (order_book_side.CountedBids, 'count'),
+        (order_book_side.IndexedAsks, 'id'),
+        (order_book_side.IndexedBids, 'id'),
+        (order_book_side.TreeBids, None),
+        (order_book_side.TreeCountedAsks, 'count'),
+    ]
+    for side_class, third in side_classes:
+        for _ in range(20):
+            snapshot = random_snapshot(generator, 200, third)
+            expected = side_class()
+            for level in snapshot:
+                expected.storeArray(list(level))
+            actual = side_class([[1.0, 1] + ([] if third is None else ['id0' if third == 'id' else 1])])
+            actual.store_snapshot([list(level) for level in snapshot])
+            assert expected == actual
+            assert expected._index == actual._index
+            if third == 'id':
+                assert expected._hashmap == actual._hashmap
+
+
+def test_reset_replaces_every_level():
+    orderbook = IndexedOrderBook({'asks': [[1.0, 1, 'a'], [2.0, 1, 'b']]})
+    orderbook.reset({'asks': [[3.0, 1, 'c'], [3.0, 2, 'a']], 'nonce': 5})
+    assert orderbook['asks'] == [[3.0, 2, 'a'], [3.0, 1, 'c']]
+    assert orderbook['asks']._index == [(3.0, 'a'), (3.0, 'c')]
+    orderbook['asks'].store(None, 4, 'c')
+    assert orderbook['asks'][1] == [3.0, 4, 'c']
+    tree = TreeCountedOrderBook({}, 2)
+    tree.reset({'bids': [[1.0, 1, 1], [3.0, 1, 1], [2.0, 1, 0]]})
+    tree.limit()
+    assert tree['bids'] == [[3.0, 1, 1], [1.0, 1, 1]]
+    orderbook = OrderBook().set_wire_strings()
+    orderbook.reset({'bids': [['1.50', '2.0'], ['1.25', '3.0']]})
+    assert orderbook['bids'][0][0].string == '1.50'
+
+
+def test_ws_order_book_snapshot():
+    test_store_snapshot_matches_store_array()
+    test_reset_replaces_every_level()
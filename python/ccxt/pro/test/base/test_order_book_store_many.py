@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+import ccxt.async_support  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, CountedOrderBook, IndexedOrderBook, TreeOrderBook  # noqa: E402
+
+
+def random_message(generator, count, with_counts, side):
+    prices = sorted(set(generator.randint(1, 500) / 10 for _ in range(count)), reverse=(side == 'bids'))
+    if generator.random() < 0.2:
+        generator.shuffle(prices)
+    sizes = [generator.choice([0, generator.randint(1, 100)]) for _ in prices]
+    counts = [generator.randint(0 if size else 1, 3) for size in sizes] if with_counts else None
+    return prices, sizes, counts
+
+
+def test_store_many_matches_store_array():
+    generator = random.Random(3)
+    for book_class, with_counts in [(OrderBook, False), (CountedOrderBook, True), (TreeOrderBook, False)]:
+        expected = book_class()
+        actual = book_class()
+        for i in range(400):
+            side = 'bids' if i % 2 else 'asks'
+            # small messages take the bisect path, large ones rebuild the side
+            prices, sizes, counts = random_message(generator, generator.choice([3, 300]), with_counts, side)
+            for j in range(len(prices)):
+                expected[side].storeArray([prices[j], sizes[j]] + ([counts[j]] if with_counts else []))
+            actual[side].store_many(prices, sizes, counts)
+            assert expected[side] == actual[side]
+            assert expected[side]._index == actual[side]._index
+        expected.limit()
+        actual.limit()
+        assert expected == actual
+
+
+def test_store_many_duplicates_and_indexed():
+    orderbook = OrderBook()
+    orderbook['asks'].store_many([1.0, 2.0, 1.0], [1, 1, 0])
+    assert orderbook['asks'] == [[2.0, 1]]
+    indexed = IndexedOrderBook()
+    indexed['bids'].store_many([1.0, 1.0, 2.0], [1, 2, 3], ['b', 'a', 'c'])
+    assert indexed['bids'] == [[2.0, 3, 'c'], [1.0, 2, 'a'], [1.0, 1, 'b']]
+
+
+def test_handle_deltas_with_keys_stores_many():
+    exchange = ccxt.async_support.Exchange()
+    orderbook = exchange.counted_order_book()
+    exchange.handle_deltas_with_keys(orderbook['bids'], [['2.0', '1', '0', '3'], ['1.5', '2', '0', '1']], 0, 1, 3)
+    assert orderbook['bids'] == [[2.0, 1.0, 3], [1.5, 2.0, 1]]
+    orderbook = exchange.order_book().set_wire_strings()
+    exchange.handle_deltas_with_keys(orderbook['asks'], [['3.10', '1.0'], ['3.20', '2.0']])
+    assert orderbook['asks'] == [[3.1, 1.0], [3.2, 2.0]]
+    assert orderbook['asks'][0][0].string == '3.10'
+
+
+def test_ws_order_book_store_many():
+    test_store_many_matches_store_array()
+    test_store_many_duplicates_and_indexed()
+    test_handle_deltas_with_keys_stores_many()
@@ -0,0 +1,71 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+import ccxt.async_support  # noqa: E402
+from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, TreeOrderBook  # noqa: E402
+
+
+def test_tick_keys_merge_drifting_prices():
+    for book_class in [OrderBook, TreeOrderBook]:
+        orderbook = book_class().set_tick_size(0.1)
+        bids = orderbook['bids']
+        bids.store(0.1 + 0.2, 1.0)
+        # 0.3 != 0.1 + 0.2 as floats, but both are 3 ticks
+        bids.store(0.3, 2.0)
+        bids.store(0.2, 1.0)
+        assert len(bids) == 2
+        assert bids[0][1] == 2.0
+        bids.store(0.30000000000000004, 0)
+        assert bids == [[0.2, 1.0]]
+
+
+def test_tick_keys_rekey_existing_levels():
+    orderbook = OrderBook({'bids': [[1.5, 1], [1.25, 2]], 'asks': [[1.75, 3]]}).set_tick_size(0.25)
+    assert orderbook['bids']._index == [-6, -5]
+    assert orderbook['asks']._index == [7]
+    orderbook['asks'].store(2.0, 1)
+    assert orderbook['asks'] == [[1.75, 3], [2.0, 1]]
+    orderbook.set_tick_size(None)
+    assert orderbook['bids']._index == [-1.5, -1.25]
+
+
+def test_tick_keys_indexed():
+    orderbook = IndexedOrderBook().set_tick_size(0.5)
+    asks = orderbook['asks']
+    asks.store(10.5, 1, 'a')
+    asks.store(10.0, 1, 'b')
+    asks.store(None, 2, 'a')
+    assert asks == [[10.0, 1, 'b'], [10.5, 2, 'a']]
+    asks.store(11.0, 3, 'b')
+    assert asks == [[10.5, 2, 'a'], [11.0, 3, 'b']]
+    orderbook.reset({'asks': [[12.0, 1, 'c']]})
+    assert asks == [[12.0, 1, 'c']]
+    assert asks._index == [(24, 'c')]
+
+
+def test_tick_size_from_market():
+    exchange = ccxt.async_support.Exchange({
+        'options': {'ws': {'orderBookTickSize': True}},
+    })
+    exchange.markets = {
+        'BTC/USDT': {'precision': {'price': 0.01}},
+    }
+    exchange.precisionMode = TICK_SIZE
+    exchange.orderbooks['BTC/USDT'] = exchange.order_book()
+    exchange.orderbooks['ETH/USDT'] = exchange.order_book()
+    assert exchange.orderbooks['BTC/USDT']['bids'].tick == 0.01
+    assert exchange.orderbooks['ETH/USDT']['bids'].tick is None
+    exchange.precisionMode = DECIMAL_PLACES
+    exchange.markets['BTC/USDT']['precision']['price'] = 3
+    assert exchange.order_book_tick_size('BTC/USDT') == 0.001
+
+
+def test_ws_order_book_tick_size():
+    test_tick_keys_merge_drifting_prices()
+    test_tick_keys_rekey_existing_levels()
+    test_tick_keys_indexed()
+    test_tick_size_from_market()
@@ -0,0 +1,51 @@
+import binascii
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.order_book import OrderBook, CountedOrderBook, IndexedOrderBook, TreeOrderBook  # noqa: E402
+from ccxt.async_support.base.ws.order_book_checksum import OrderBookChecksum, checksum_formats  # noqa: E402
+
+
+def test_wire_strings_are_kept():
+    for book_class in [OrderBook, TreeOrderBook]:
+        orderbook = book_class().set_wire_strings()
+        bids = orderbook['bids']
+        bids.store('0.10', '1.500')
+        bids.store('0.20', '2')
+        bids.store('0.10', '1.250')
+        bids.store('0.20', '0.000')
+        assert bids == [[0.1, 1.25]]
+        assert bids[0][0].string == '0.10'
+        assert bids[0][1].string == '1.250'
+        # floats stored next to the strings keep working
+        bids.store(0.3, 1.0)
+        assert bids == [[0.3, 1.0], [0.1, 1.25]]
+
+
+def test_wire_strings_counted_and_indexed():
+    counted = CountedOrderBook().set_wire_strings()
+    counted['asks'].store('11.0', '1.0', 2)
+    counted['asks'].store('11.0', '3.0', 1)
+    assert counted['asks'][0][1].string == '3.0'
+    indexed = IndexedOrderBook().set_wire_strings()
+    indexed['asks'].store('11.0', '1.0', 'a')
+    indexed['asks'].store(None, '2.0', 'a')
+    assert indexed['asks'] == [[11.0, 2.0, 'a']]
+    assert indexed['asks'][0][1].string == '2.0'
+
+
+def test_checksum_uses_wire_strings():
+    kraken = OrderBook().set_wire_strings()
+    kraken['asks'].store('0.05000', '1.50000000')
+    kraken['bids'].store('0.04000', '2.00000000')
+    payload = '5000' + '150000000' + '4000' + '200000000'
+    assert OrderBookChecksum(checksum_formats['kraken'])(kraken) == binascii.crc32(payload.encode())
+
+
+def test_ws_order_book_wire_strings():
+    test_wire_strings_are_kept()
+    test_wire_strings_counted_and_indexed()
+    test_checksum_uses_wire_strings()
@@ -0,0 +1,25 @@
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.base.rate_limiter import MemoryRateLimiterBackend  # noqa: E402
+import ccxt.pro  # noqa: E402
+
+
+def test_ws_throttle_without_backend():
+    async def run():
+        # the ws connections of an exchange with a backend do not spend from it
+        backend = MemoryRateLimiterBackend()
+        exchange = ccxt.pro.binance({'tokenBucket': {'backend': backend, 'key': 'apikey'}})
+        client = exchange.client('wss://stream.binance.com:9443/ws')
+        assert client.throttle.config['backend'] is None and client.throttle.config['key'] == 'default'
+        assert exchange.throttler.config['backend'] is backend
+        await exchange.close()
+    asyncio.run(run())
+
+
+def test_ws_throttler():
+    test_ws_throttle_without_backend()
@@ -0,0 +1,129 @@
+import json
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.order_book import OrderBook, CountedOrderBook, TreeOrderBook, TreeCountedOrderBook  # noqa: E402
+from ccxt.async_support.base.ws.order_book_side import TreeOrderBookSide  # noqa: E402
+from ccxt.base.errors import NotSupported  # noqa: E402
+
+
+def random_deltas(count, seed, with_counts=False):
+    generator = random.Random(seed)
+    deltas = []
+    for _ in range(count):
+        price = generator.randint(1, 3000) / 10
+        size = generator.choice([0, 0, generator.randint(1, 100)])
+        if with_counts:
+            deltas.append([price, size, generator.randint(0 if size else 1, 5)])
+        else:
+            deltas.append([price, size])
+    return deltas
+
+
+def test_tree_order_book_matches_list_engine():
+    original_load = TreeOrderBookSide.load
+    # tiny chunks exercise the split and merge paths
+    TreeOrderBookSide.load = 4
+    try:
+        for depth in [None, 25]:
+            book = OrderBook({}, depth)
+            tree = TreeOrderBook({}, depth)
+            for i, delta in enumerate(random_deltas(5000, depth or 1)):
+                side = 'bids' if i % 2 else 'asks'
+                book[side].storeArray(list(delta))
+                tree[side].storeArray(list(delta))
+                if i % 97 == 0 and len(book[side]):
+                    assert book[side][0] == tree[side][0]
+                    assert book[side][-1] == tree[side][-1]
+                    assert len(book[side]) == len(tree[side])
+                if i % 500 == 0:
+                    book.limit()
+                    tree.limit()
+                    assert book == tree
+            book.limit()
+            tree.limit()
+            assert book == tree
+            assert book['bids'][3:10] == tree['bids'][3:10]
+            assert list(reversed(book['asks'])) == list(reversed(tree['asks']))
+    finally:
+        TreeOrderBookSide.load = original_load
+
+
+def test_tree_counted_order_book_matches_list_engine():
+    book = CountedOrderBook({}, 10)
+    tree = TreeCountedOrderBook({}, 10)
+    for i, delta in enumerate(random_deltas(2000, 7, True)):
+        side = 'bids' if i % 2 else 'asks'
+        book[side].storeArray(list(delta))
+        tree[side].storeArray(list(delta))
+    book.limit()
+    tree.limit()
+    assert book == tree
+
+
+def test_tree_order_book_reset():
+    tree = TreeOrderBook({'bids': [[1, 1], [2, 2]], 'asks': [[3, 3]]})
+    tree.reset({'bids': [[5, 1], [4, 1]], 'asks': [[6, 1], [7, 0]], 'nonce': 2})
+    tree.limit()
+    assert tree['bids'] == [[5, 1], [4, 1]]
+    assert tree['asks'] == [[6, 1]]
+    assert tree['nonce'] == 2
+
+
+def test_tree_order_book_side_is_a_list():
+    original_load = TreeOrderBookSide.load
+    TreeOrderBookSide.load = 4
+    try:
+        book = OrderBook({}, 30)
+        tree = TreeOrderBook({}, 30)
+        for delta in random_deltas(400, 3):
+            book['bids'].storeArray(list(delta))
+            tree['bids'].storeArray(list(delta))
+        book.limit()
+        tree.limit()
+        bids = book['bids']
+        levels = tree['bids']
+        top = bids[5]
+        # slices across the chunks, with steps and from the end
+        for item in [slice(None, 10), slice(3, 17), slice(-5, None), slice(None, None, -3), slice(8, 2, -1), slice(40, 50)]:
+            assert bids[item] == levels[item]
+        assert list(levels) == bids[:] and list(reversed(levels)) == list(reversed(bids))
+        assert top in levels and [top[0], top[1] + 1] not in levels
+        assert levels.copy() == bids.copy() and type(levels.copy()) is list
+        assert levels.count(top) == 1 and levels.index(top) == 5
+        assert levels + [[0, 1]] == bids[:] + [[0, 1]]
+        assert bool(levels) and not bool(TreeOrderBook()['bids'])
+        assert json.loads(json.dumps(levels)) == json.loads(json.dumps(bids))
+        # the list methods that write would change the empty list under the chunks
+        writes = [
+            lambda: levels.append([1, 1]),
+            lambda: levels.insert(0, [1, 1]),
+            lambda: levels.extend([[1, 1]]),
+            lambda: levels.sort(),
+            lambda: levels.pop(),
+            lambda: levels.remove(top),
+            lambda: levels.reverse(),
+            lambda: levels.__setitem__(0, [1, 1]),
+            lambda: levels.__delitem__(0),
+            lambda: levels.__iadd__([[1, 1]]),
+        ]
+        for write in writes:
+            try:
+                write()
+                assert False
+            except NotSupported:
+                pass
+        assert list(levels) == bids[:]
+    finally:
+        TreeOrderBookSide.load = original_load
+
+
+def test_ws_tree_order_book():
+    test_tree_order_book_matches_list_engine()
+    test_tree_counted_order_book_matches_list_engine()
+    test_tree_order_book_reset()
+    test_tree_order_book_side_is_a_list()
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+import ccxt.pro  # noqa: E402
+from ccxt.base.errors import ExchangeError  # noqa: E402
+
+url = 'wss://stream.binance.com:9443/ws'
+
+
+def subscribe(exchange, hashes):
+    # what watch() and watch_multiple() do with the client, without connecting
+    client = exchange.pooled_client(url, hashes)
+    for subscribe_hash in hashes:
+        client.subscriptions[subscribe_hash] = True
+    return client
+
+
+def test_connection_pool_packing():
+    async def run():
+        exchange = ccxt.pro.binance({'options': {'ws': {'connectionPool': {'maxSubscriptions': 3, 'maxConnections': 3}}}})
+        first = subscribe(exchange, ['a', 'b'])
+        assert first is exchange.client(url) and first.key == url
+        assert subscribe(exchange, ['c']) is first
+        second = subscribe(exchange, ['d', 'e'])
+        assert second is not first and second.key == url + '#1' and second.url == url
+        # a subscription that exists stays on its connection
+        assert subscribe(exchange, ['a']) is first and subscribe(exchange, ['e']) is second
+        assert subscribe(exchange, ['f']) is second
+        third = subscribe(exchange, ['g'])
+        assert exchange.ws_connection_counts() == {url: [3, 3, 1]}
+        assert subscribe(exchange, ['h', 'i']) is third
+        try:
+            subscribe(exchange, ['j', 'k'])
+            assert False
+        except ExchangeError:
+            pass
+        # a disconnected connection leaves the pool and the next watch calls fill the others
+        exchange.on_close(second, None)
+        assert exchange.ws_connection_counts() == {url: [3, 3]}
+        assert subscribe(exchange, ['d', 'e']).key == url + '#1'
+        await exchange.close()
+    asyncio.run(run())
+
+
+def test_connection_pool_routing():
+    async def run():
+        exchange = ccxt.pro.binance({'options': {'ws': {'connectionPool': {'maxSubscriptions': 2}}}})
+        first = subscribe(exchange, ['trade::BTC/USDT', 'trade::ETH/USDT'])
+        second = subscribe(exchange, ['trade::LTC/USDT'])
+        assert second is not first
+        # an unsubscription goes to the connection of the subscriptions it removes
+        unsubscription = {'unsubscribe': True, 'subMessageHashes': ['trade::LTC/USDT'], 'messageHashes': ['unsubscribe:trade:LTC/USDT']}
+        assert exchange.pooled_client(url, unsubscription['messageHashes'], unsubscription) is second
+        # new subscriptions go to the least used connection with room
+        third = subscribe(exchange, ['c', 'd'])
+        exchange.on_close(first, None)
+        assert exchange.ws_connection_counts() == {url: [1, 2]}
+        assert subscribe(exchange, ['trade::BTC/USDT']) is second
+        assert subscribe(exchange, ['trade::ETH/USDT']).key == url and exchange.ws_connection_counts() == {url: [2, 2, 1]}
+        assert third.key == url + '#2'
+        await exchange.close()
+        # a url that authenticates stays on the connection of self.client(url)
+        exchange = ccxt.pro.okx({'options': {'ws': {'connectionPool': {'maxSubscriptions': 1}}}})
+        private = 'wss://ws.okx.com:8443/ws/v5/private'
+        client = exchange.client(private)
+        client.future('authenticated')
+        assert exchange.pooled_client(private, ['authenticated']) is client
+        client.subscriptions['authenticated'] = True
+        assert exchange.pooled_client(private, ['orders']) is client
+        await exchange.close()
+    asyncio.run(run())
+
+
+def test_connection_pool_options():
+    async def run():
+        exchange = ccxt.pro.binance()
+        assert exchange.connection_pool(url) is None
+        assert exchange.pooled_client(url, ['a']) is exchange.client(url)
+        exchange.options['ws']['connectionPool'] = True
+        assert exchange.connection_pool(url) == (1024, 10)
+        exchange.options['ws']['connectionPool'] = {'urls': ['wss://ws-api.binance.com:443/ws-api/v3']}
+        assert exchange.connection_pool(url) is None
+        await exchange.close()
+        other = ccxt.pro.okx({'options': {'ws': {'connectionPool': {'maxConnections': 2}}}})
+        assert other.connection_pool(url) == (200, 2)
+        # the limit of an exchange is in its options
+        bitget = ccxt.pro.bitget({'options': {'ws': {'connectionPool': True}}})
+        assert bitget.connection_pool(url) == (1000, 10)
+        await bitget.close()
+        # a call without a subscription uses the first connection
+        assert other.pooled_client(url, None) is other.client(url)
+        await other.close()
+    asyncio.run(run())
+
+
+def test_ws_connection_pool():
+    test_connection_pool_packing()
+    test_connection_pool_routing()
+    test_connection_pool_options()
@@ -0,0 +1,133 @@
+import asyncio
+import gzip
+import os
+import sys
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from aiohttp import WSMsgType  # noqa: E402
+
+from ccxt.async_support.base.ws.client import Client  # noqa: E402
+from ccxt.async_support.base.ws.decoders import json_decoders, json_decoder  # noqa: E402
+from ccxt.async_support.base.ws.functions import gunzip, inflate  # noqa: E402
+from ccxt.base.errors import NotSupported  # noqa: E402
+
+
+class Message:
+    def __init__(self, type, data):
+        self.type = type
+        self.data = data
+
+
+def create_client(decoder):
+    received = []
+    client = Client('wss://example.com', lambda client, message: received.append(message), None, None, None, {'decoder': decoder})
+    return client, received
+
+
+def test_ws_decoders_decode_frames():
+    asyncio.run(decode_frames())
+
+
+async def decode_frames():
+    frames = [
+        Message(WSMsgType.TEXT, '{"e":"depthUpdate","b":[["1.5","2"]]}'),
+        Message(WSMsgType.BINARY, b'[1,{"a":null}]'),
+        Message(WSMsgType.TEXT, 'pong'),
+        Message(WSMsgType.BINARY, b'pong'),
+        Message(WSMsgType.TEXT, '{'),
+    ]
+    expected = [{'e': 'depthUpdate', 'b': [['1.5', '2']]}, [1, {'a': None}], 'pong', 'pong', '{']
+    tested = 0
+    for name in [None] + list(json_decoders):
+        try:
+            client, received = create_client(name)
+        except NotSupported:
+            # the package of the decoder is not installed
+            continue
+        for frame in frames:
+            client.handle_message(frame)
+        assert received == expected
+        tested += 1
+    assert tested >= 2
+
+
+def test_ws_decoders_options():
+    asyncio.run(decoders_options())
+
+
+async def decoders_options():
+    client, received = create_client(lambda data: ('decoded', data))
+    client.handle_message(Message(WSMsgType.BINARY, b'{"a":1}'))
+    assert received == [('decoded', b'{"a":1}')]
+    try:
+        create_client('yaml')
+        assert False
+    except NotSupported:
+        pass
+
+
+def test_ws_decoders_decompress():
+    asyncio.run(decompress_frames())
+
+
+async def decompress_frames():
+    text = '{"ch":"market.btcusdt.depth","tick":{"bids":[[1.5,2]]}}'
+    assert gunzip(gzip.compress(text.encode())) == text
+    deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    deflated = deflate.compress(text.encode()) + deflate.flush()
+    assert inflate(deflated) == text.encode()
+    decoded = {'ch': 'market.btcusdt.depth', 'tick': {'bids': [[1.5, 2]]}}
+    for option, frame, expected in [('gunzip', gzip.compress(text.encode()), decoded), ('inflate', deflated, decoded), ('gunzip', gzip.compress(b'ping'), 'ping')]:
+        received = []
+        client = Client('wss://example.com', lambda client, message: received.append(message), None, None, None, {option: True})
+        client.handle_message(Message(WSMsgType.BINARY, frame))
+        assert received == [expected]
+
+
+def test_ws_decoders_threads():
+    # the offload threads share one decoder
+    try:
+        decode = json_decoder('simdjson')
+    except NotSupported:
+        return
+    barrier = threading.Barrier(4)
+
+    def run(index):
+        barrier.wait()
+        frames = [('{"i":%d,"j":%d,"levels":[["%d.5","1"]]}' % (index, j, j)).encode() for j in range(500)]
+        return all(decode(frame) == {'i': index, 'j': j, 'levels': [[str(j) + '.5', '1']]} for j, frame in enumerate(frames))
+
+    with ThreadPoolExecutor(4) as executor:
+        assert all(executor.map(run, range(4)))
+
+
+def test_ws_decoders_compress_option():
+    class Session:
+        def ws_connect(self, url, **kwargs):
+            self.kwargs = kwargs
+            return self
+
+        def __aenter__(self):
+            return None
+
+    async def run():
+        session = Session()
+        client = Client('wss://example.com', None, None, None, None, {'compress': 15})
+        client.create_connection(session)
+        assert session.kwargs['compress'] == 15
+        Client('wss://example.com', None, None, None, None, {}).create_connection(session)
+        assert session.kwargs['compress'] == 0
+    asyncio.run(run())
+
+
+def test_ws_decoders():
+    test_ws_decoders_decode_frames()
+    test_ws_decoders_options()
+    test_ws_decoders_decompress()
+    test_ws_decoders_threads()
+    test_ws_decoders_compress_option()
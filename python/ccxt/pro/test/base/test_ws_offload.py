@@ -0,0 +1,85 @@
+import asyncio
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from aiohttp import WSMsgType  # noqa: E402
+
+from ccxt.async_support.base.ws.client import Client  # noqa: E402
+from ccxt.base.errors import NotSupported  # noqa: E402
+
+
+class Message:
+    def __init__(self, type, data):
+        self.type = type
+        self.data = data
+
+
+def slow_loads(data):
+    # decoders that finish out of order
+    time.sleep(random.random() / 200)
+    return json.loads(data)
+
+
+async def receive(config, frames):
+    received = []
+    closed = asyncio.get_running_loop().create_future()
+
+    def on_close(client, code):
+        received.append(('close', code))
+        closed.set_result(True)
+
+    client = Client('wss://example.com', lambda client, message: received.append(message), None, on_close, None, dict(config, asyncio_loop=asyncio.get_running_loop()))
+    for frame in frames:
+        client.handle_message(frame)
+    client.handle_message(Message(WSMsgType.CLOSE, 1000))
+    await asyncio.wait_for(closed, 10)
+    assert not client.pending
+    return received
+
+
+def test_ws_offload_threads_keep_order():
+    frames = [Message(WSMsgType.TEXT, json.dumps({'i': i})) for i in range(100)]
+    received = asyncio.run(receive({'offload': 'thread', 'offloadWorkers': 8, 'decoder': slow_loads}, frames))
+    # the close frame comes after the messages before it
+    assert received == [{'i': i} for i in range(100)] + [('close', 1000)]
+
+
+def test_ws_offload_verbose():
+    logged = []
+    frames = [Message(WSMsgType.TEXT, json.dumps({'i': i})) for i in range(3)]
+    received = asyncio.run(receive({'offload': 'thread', 'verbose': True, 'log': lambda *args: logged.append(args)}, frames))
+    assert received == [{'i': i} for i in range(3)] + [('close', 1000)]
+    # the offloaded frames are logged like the ones decoded on the loop
+    assert [args[2] for args in logged if args[1] == 'message'] == [frame.data for frame in frames]
+
+
+def test_ws_offload_processes():
+    frames = [Message(WSMsgType.BINARY, gzip.compress(json.dumps({'i': i}).encode())) for i in range(50)]
+    frames.append(Message(WSMsgType.BINARY, gzip.compress(b'pong')))
+    received = asyncio.run(receive({'offload': 'process', 'offloadWorkers': 2, 'gunzip': True}, frames))
+    assert received == [{'i': i} for i in range(50)] + ['pong', ('close', 1000)]
+
+
+def test_ws_offload_options():
+    async def run():
+        for config in [{'offload': 'fiber'}, {'offload': 'process', 'decoder': slow_loads}]:
+            try:
+                Client('wss://example.com', None, None, None, None, config)
+                assert False
+            except NotSupported:
+                pass
+    asyncio.run(run())
+
+
+def test_ws_offload():
+    test_ws_offload_threads_keep_order()
+    test_ws_offload_verbose()
+    test_ws_offload_processes()
+    test_ws_offload_options()
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from aiohttp import WSMsgType  # noqa: E402
+
+import ccxt.pro  # noqa: E402
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class Message:
+    def __init__(self, type, data):
+        self.type = type
+        self.data = data
+
+
+class binance(ccxt.pro.binance):
+    def handle_typed_book_ticker(self, client, message):
+        self.typed.append(message)
+
+    def handle_message(self, client, message):
+        self.generic.append(message)
+
+
+def test_typed_channels():
+    async def run():
+        exchange = binance({'options': {'ws': {'typedChannels': ['bookTicker', 'depthUpdate']}}})
+        exchange.typed = []
+        exchange.generic = []
+        client = exchange.client('wss://stream.binance.com:9443/ws')
+        ticker = b'{"u":400900217,"s":"BNBUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}'
+        depth = '{"e":"depthUpdate","E":1,"s":"BNBUSDT","U":157,"u":160,"b":[["0.0024","10"]],"a":[]}'
+        # the quantity is a number, the schema expects a string
+        unexpected = b'{"u":1,"s":"BNBUSDT","b":"25.3","B":"31.21","a":"25.4","A":40}'
+        # the 24hrTicker frames have the fields of bookTicker too
+        daily = b'{"e":"24hrTicker","E":1,"s":"BNBUSDT","p":"0.1","c":"25.3","b":"25.3","B":"31.21","a":"25.4","A":"40"}'
+        # the match is there but the fields of bookTicker are not
+        other = b'{"u":7,"result":null}'
+        for data in [ticker, depth, unexpected, daily, other]:
+            client.handle_message(Message(WSMsgType.TEXT if isinstance(data, str) else WSMsgType.BINARY, data))
+        if msgspec is None:
+            assert client.typed_channels is None
+            assert len(exchange.generic) == 5
+            return
+        assert len(exchange.typed) == 1
+        typed = exchange.typed[0]
+        assert (typed.s, typed.b, typed.B, typed.a, typed.A, typed.u, typed.e) == ('BNBUSDT', '25.35190000', '31.21000000', '25.36520000', '40.66000000', 400900217, None)
+        assert not hasattr(typed, '__dict__')
+        # depthUpdate has no schema and stays on the usual path like the messages that do not fit
+        assert exchange.generic[0]['e'] == 'depthUpdate' and exchange.generic[1]['A'] == 40
+        assert exchange.generic[2]['e'] == '24hrTicker' and exchange.generic[3] == {'u': 7, 'result': None}
+        assert len(exchange.generic) == 4
+        await exchange.close()
+    asyncio.run(run())
+
+
+def test_typed_book_ticker_handler():
+    async def run():
+        # without an override the usual handler of bookTicker gets the fields as a dict
+        exchange = ccxt.pro.binance({'options': {'ws': {'typedChannels': ['bookTicker']}}})
+        client = exchange.client('wss://stream.binance.com:9443/ws')
+        if msgspec is not None:
+            assert [channel[3] for channel in client.typed_channels] == [exchange.handle_bids_asks, exchange.handle_bids_asks]
+        ticker = b'{"u":400900217,"s":"BNBUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}'
+        client.handle_message(Message(WSMsgType.BINARY, ticker))
+        bids_asks = exchange.bidsasks['BNBUSDT']
+        assert (bids_asks['bid'], bids_asks['bidVolume'], bids_asks['ask'], bids_asks['askVolume']) == (25.3519, 31.21, 25.3652, 40.66)
+        # the missing optional fields are left out, info is the message as it came
+        assert bids_asks['info'] == json.loads(ticker) and type(bids_asks['info']) is dict
+        json.dumps(bids_asks)
+        await exchange.close()
+    asyncio.run(run())
+
+
+def test_typed_channels_schemas():
+    async def run():
+        exchange = binance()
+        assert exchange.typed_channels() is None
+        exchange.options['ws'] = {'typedChannels': True, 'schemas': {'bookTicker': {'match': '"B":"', 'fields': {'s': 'str', 'levels': [{'p': 'float'}]}}}}
+        channels = exchange.typed_channels()
+        if msgspec is None:
+            assert channels is None
+            return
+        assert len(channels) == 1
+        match, match_bytes, decode, handler = channels[0]
+        message = decode(b'{"s":"BNBUSDT","B":"1","levels":[{"p":1.5},{"p":2}]}')
+        assert message.s == 'BNBUSDT' and [level.p for level in message.levels] == [1.5, 2.0]
+        # the fields without ? are required
+        try:
+            decode(b'{"B":"1","levels":[]}')
+            assert False
+        except ValueError:
+            pass
+        await exchange.close()
+    asyncio.run(run())
+
+
+def test_ws_typed_channels():
+    test_typed_channels()
+    test_typed_book_ticker_handler()
+    test_typed_channels_schemas()
@@ -7,14 +7,44 @@ sys.path.append(root)
 from asyncio import run
 
 from ccxt.pro.test.base.test_order_book import test_ws_order_book  # noqa: F401
+from ccxt.pro.test.base.test_tree_order_book import test_ws_tree_order_book  # noqa: F401
+from ccxt.pro.test.base.test_order_book_array import test_ws_order_book_array  # noqa: F401
+from ccxt.pro.test.base.test_order_book_depth_view import test_ws_order_book_depth_view  # noqa: F401
+from ccxt.pro.test.base.test_order_book_checksum import test_ws_order_book_checksum  # noqa: F401
+from ccxt.pro.test.base.test_order_book_wire_strings import test_ws_order_book_wire_strings  # noqa: F401
+from ccxt.pro.test.base.test_order_book_tick_size import test_ws_order_book_tick_size  # noqa: F401
+from ccxt.pro.test.base.test_order_book_store_many import test_ws_order_book_store_many  # noqa: F401
+from ccxt.pro.test.base.test_order_book_snapshot import test_ws_order_book_snapshot  # noqa: F401
+from ccxt.pro.test.base.test_order_book_aggregated import test_ws_order_book_aggregated  # noqa: F401
+from ccxt.pro.test.base.test_indexed_order_book import test_ws_indexed_order_book  # noqa: F401
 from ccxt.pro.test.base.test_cache import test_ws_cache  # noqa: F401
+from ccxt.pro.test.base.test_throttler import test_ws_throttler  # noqa: F401
+from ccxt.pro.test.base.test_ws_decoders import test_ws_decoders  # noqa: F401
+from ccxt.pro.test.base.test_ws_typed_channels import test_ws_typed_channels  # noqa: F401
+from ccxt.pro.test.base.test_ws_offload import test_ws_offload  # noqa: F401
+from ccxt.pro.test.base.test_ws_connection_pool import test_ws_connection_pool  # noqa: F401
 # todo : from ccxt.pro.test.base.test_close import test_ws_close  # noqa: F401
 from ccxt.pro.test.base.test_future import test_ws_future  # noqa: F401
 from ccxt.pro.test.base.test_abnormal_close import test_abnormal_close  # noqa: F401
 
 def test_base_init_ws():
     test_ws_order_book()
+    test_ws_tree_order_book()
+    test_ws_order_book_array()
+    test_ws_order_book_depth_view()
+    test_ws_order_book_checksum()
+    test_ws_order_book_wire_strings()
+    test_ws_order_book_tick_size()
+    test_ws_order_book_store_many()
+    test_ws_order_book_snapshot()
+    test_ws_order_book_aggregated()
+    test_ws_indexed_order_book()
     test_ws_cache()
+    test_ws_throttler()
+    test_ws_decoders()
+    test_ws_typed_channels()
+    test_ws_offload()
+    test_ws_connection_pool()
     # todo : run(test_ws_close())
     run(test_ws_future())
     # run(test_abnormal_close()) stays in infinite loop in travis
@@ -0,0 +1,354 @@
+import asyncio
+import os
+import selectors
+import sys
+import tempfile
+import threading
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+from ccxt.async_support.base import throttler as throttler_module  # noqa: E402
+from ccxt.async_support.base.throttler import Throttler  # noqa: E402
+from ccxt.base.types import Entry, rate_limit_priority  # noqa: E402
+from ccxt.base.rate_limiter import MemoryRateLimiterBackend, FileRateLimiterBackend, RedisRateLimiterBackend  # noqa: E402
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+# python only, the async throttler is not transpiled
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def elapsed(self, start):
+        # ms since start, rounded off the float error of the sums of the waits
+        return round((self.now - start) * 1000, 6)
+
+
+class VirtualSelector:
+    # the waits of the event loop move the clock forward instead of sleeping
+    def __init__(self, selector, clock):
+        self.selector = selector
+        self.clock = clock
+
+    def select(self, timeout=None):
+        if timeout is None:
+            return self.selector.select(None)
+        events = self.selector.select(0)
+        if not events:
+            self.clock.now += timeout
+        return events
+
+    def __getattr__(self, name):
+        return getattr(self.selector, name)
+
+
+def run_with_clock(main):
+    # runs main(clock) on a loop and a throttler that read the clock, so the release times are exact
+    clock = Clock()
+    loop = asyncio.SelectorEventLoop(VirtualSelector(selectors.DefaultSelector(), clock))
+    loop.time = clock.time
+    original = throttler_module.time
+    throttler_module.time = clock.time
+    try:
+        return loop.run_until_complete(main(clock))
+    finally:
+        throttler_module.time = original
+        loop.close()
+
+
+class CountingThrottler(Throttler):
+    wakeups = 0
+
+    def drain(self):
+        self.wakeups += 1
+        return super(CountingThrottler, self).drain()
+
+
+async def paced_calls(throttler, count):
+    start = time.perf_counter()
+    releases = []
+    for _ in range(count):
+        await throttler()
+        releases.append(time.perf_counter() - start)
+    return releases
+
+
+def test_throttler_paces_with_single_wakeups():
+    async def run(clock):
+        # one token every 50 ms
+        throttler = CountingThrottler({'refillRate': 1 / 50, 'capacity': 1, 'delay': 0})
+        start = clock.now
+        releases = []
+        for _ in range(5):
+            await throttler()
+            releases.append(clock.elapsed(start))
+        assert releases == [0, 50, 100, 150, 200]
+        # a polling looper would wake up 200 times here, this one about once per call
+        assert throttler.wakeups <= 11
+        assert not throttler.running
+    run_with_clock(run)
+
+
+def test_throttler_bursts_and_cancels():
+    async def run(clock):
+        throttler = Throttler({'refillRate': 1 / 100, 'capacity': 3, 'tokens': 2, 'delay': 0})
+        futures = [throttler() for _ in range(5)]
+        await asyncio.sleep(0)
+        # tokens 2 -> 1 -> 0 -> -1, three calls go through at once
+        assert [future.done() for future in futures] == [True, True, True, False, False]
+        futures[3].cancel()
+        start = clock.now
+        await futures[4]
+        # the cancelled call did not spend a token, the last one waits for one refill
+        assert clock.elapsed(start) == 100
+    run_with_clock(run)
+
+
+def test_throttler_priority_lanes():
+    async def run(clock):
+        throttler = Throttler({'refillRate': 1 / 20, 'capacity': 1, 'delay': 0})
+        start = clock.now
+        released = []
+        calls = [('market', 'a'), ('market', 'b'), (None, 'c'), ('trading', 'd'), ('market', 'e')]
+        futures = []
+        for priority, name in calls:
+            future = throttler(1, priority)
+            future.add_done_callback(lambda _, name=name: released.append((name, clock.elapsed(start))))
+            futures.append(future)
+        await asyncio.gather(*futures)
+        # 'a' takes the free token, the rest waits for tokens by lane
+        assert released == [('a', 0), ('d', 20), ('c', 40), ('b', 60), ('e', 80)]
+        assert throttler.lanes == {} and throttler.length == 0
+    run_with_clock(run)
+
+
+def test_throttler_uses_its_loop():
+    # the calls are made before the loop of the exchange runs, the wakeups are scheduled on that loop
+    loop = asyncio.new_event_loop()
+    try:
+        throttler = Throttler({'refillRate': 1 / 10, 'capacity': 1, 'delay': 0}, loop)
+        first = throttler()
+        second = throttler()
+        assert first.get_loop() is loop and throttler.timer is not None
+        loop.run_until_complete(asyncio.wait_for(asyncio.gather(first, second), 1))
+    finally:
+        loop.close()
+
+
+def test_entry_sets_rate_limit_priority():
+    class Sample:
+        synchronous = False
+        privatePostOrder = Entry('order', 'private', 'POST', {'cost': 1, 'priority': 'trading'})
+        publicGetTicker = Entry('ticker', 'public', 'GET', {'cost': 1})
+
+        async def request(self, path, api, method, params, config={}):
+            return rate_limit_priority.get(), params
+
+    async def run():
+        sample = Sample()
+        assert await sample.privatePostOrder({'symbol': 'BTCUSDT'}) == ('trading', {'symbol': 'BTCUSDT'})
+        assert await sample.publicGetTicker({'rateLimitPriority': 'market', 'symbol': 'BTCUSDT'}) == ('market', {'symbol': 'BTCUSDT'})
+        assert await sample.publicGetTicker() == (None, {})
+    asyncio.run(run())
+
+    class SyncSample:
+        synchronous = True
+        publicGetTicker = Entry('ticker', 'public', 'GET', {'cost': 1})
+
+        def request(self, path, api, method, params, config={}):
+            return rate_limit_priority.get(), params
+
+    # the sync throttle() has no lanes, the priority is only taken out of the params
+    assert SyncSample().publicGetTicker({'rateLimitPriority': 'trading'}) == (None, {})
+
+
+def test_throttler_buckets():
+    async def run(clock):
+        throttler = Throttler({
+            'refillRate': 1 / 10,
+            'capacity': 1,
+            'delay': 0,
+            'buckets': {
+                'orders': {'refillRate': 1 / 1000, 'capacity': 1},
+            },
+        })
+        start = clock.now
+        await throttler({'default': 1, 'orders': 1})
+        order = throttler({'default': 1, 'orders': 1})
+        # market data only spends request weight and passes the waiting order
+        for _ in range(3):
+            await throttler(1)
+        assert not order.done() and clock.elapsed(start) == 30
+        await order
+        assert clock.elapsed(start) == 1000
+        try:
+            throttler({'weight': 1})
+            assert False
+        except ValueError:
+            pass
+    run_with_clock(run)
+
+
+def test_throttler_follows_rate_limit_headers():
+    exchange = ccxt.async_support.binance({'options': {'rateLimitHeaders': True}})
+    bucket = exchange.throttler.config
+    configured = bucket['refillRate']
+    spot = 'https://api.binance.com/api/v3/depth'
+    futures = 'https://fapi.binance.com/fapi/v1/depth'
+    now = exchange.milliseconds()
+    left = 60000 - now % 60000
+    exchange.handle_rate_limit_headers(spot, {'X-MBX-USED-WEIGHT-1M': '5900'})
+    # 100 weight left = 20 tokens over the rest of the minute
+    assert abs(bucket['refillRate'] - min(20 * 0.9 / left, configured)) < 1e-4
+    # 1900 futures weight left = 1900 tokens, more than the configured rate allows
+    exchange.handle_rate_limit_headers(futures, {'x-mbx-used-weight-1m': '500'})
+    assert bucket['refillRate'] == configured
+    exchange.handle_rate_limit_headers(futures, {'x-mbx-used-weight-1m': '2400'})
+    assert bucket['refillRate'] == configured
+    state = exchange.throttler.state
+    assert state['default'][0] < -1
+    # the options api has no spec
+    tokens = state['default'][0]
+    exchange.handle_rate_limit_headers('https://eapi.binance.com/eapi/v1/depth', {'x-mbx-used-weight-1m': '5900'})
+    assert state['default'][0] == tokens and bucket['refillRate'] == configured
+    exchange.throttler.update_usage(10, 1000, exhausted_only=True)
+    assert bucket['refillRate'] == configured
+    # the exchanges derived from binance use its format
+    usdm = ccxt.async_support.binanceusdm({'options': {'rateLimitHeaders': True}})
+    assert usdm.handle_rate_limit_headers(futures, {'x-mbx-used-weight-1m': '2400'}) is None
+    assert usdm.throttler.state['default'][0] < -1
+    # an unknown format fails in the constructor, never on a response
+    try:
+        ccxt.async_support.okx({'options': {'rateLimitHeaders': True}})
+        assert False
+    except ccxt.NotSupported:
+        pass
+    exchange.options['rateLimitHeaders'] = 'unknown'
+    assert exchange.handle_rate_limit_headers(spot, {}) is None
+
+
+def test_throttler_shares_backend():
+    async def run(backend):
+        # two instances with the same key draw from one bucket of one token every 40 ms
+        config = {'refillRate': 1 / 40, 'capacity': 1, 'backend': backend, 'key': 'apikey'}
+        first = Throttler(dict(config))
+        second = Throttler(dict(config))
+        other = Throttler(dict(config, key='otherkey'))
+        start = time.perf_counter()
+        await asyncio.gather(paced_calls(first, 3), paced_calls(second, 3))
+        elapsed = time.perf_counter() - start
+        # six calls take five refills together, alone three would take two
+        assert 0.18 < elapsed < 0.4
+        start = time.perf_counter()
+        await other()
+        assert time.perf_counter() - start < 0.02
+    asyncio.run(run(MemoryRateLimiterBackend()))
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(FileRateLimiterBackend(os.path.join(directory, 'buckets.json'))))
+
+
+class FailingBackend(MemoryRateLimiterBackend):
+    failures = 1
+
+    def acquire(self, key, costs, buckets):
+        self.thread = threading.current_thread()
+        if self.failures:
+            self.failures -= 1
+            raise ccxt.NetworkError('backend unavailable')
+        return super(FailingBackend, self).acquire(key, costs, buckets)
+
+
+def test_throttler_backend_off_the_loop():
+    async def run():
+        backend = FailingBackend()
+        throttler = Throttler({'refillRate': 1 / 40, 'capacity': 1, 'tokens': 1, 'backend': backend})
+        try:
+            await throttler()
+            assert False
+        except ccxt.NetworkError:
+            pass
+        assert backend.thread is not threading.current_thread()
+        assert not throttler.running and throttler.length == 0
+        await throttler()
+        # the usage an exchange reports reaches the tokens in the backend
+        await throttler.update_usage(0, 1000)
+        assert backend.states['default']['default'][0] <= -1000 / 40
+    asyncio.run(run())
+
+
+class RecordingRedis:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def eval(self, script, count, *args):
+        self.calls.append((script, count, args))
+        return self.results.pop(0)
+
+
+def test_redis_rate_limiter_backend():
+    client = RecordingRedis([[b'', b'12.5'], ['', ''], ''])
+    backend = RedisRateLimiterBackend(client, 'throttle:', 1000)
+    buckets = {
+        'default': {'refillRate': 0.02, 'capacity': 1, 'tokens': 0},
+        'orders': {'refillRate': 0.001, 'capacity': 10, 'tokens': 10},
+    }
+    assert backend.acquire('apikey', {'default': 1, 'orders': 2}, buckets) == {'orders': 12.5}
+    script, count, args = client.calls[0]
+    assert script == RedisRateLimiterBackend.script and count == 2
+    assert args == ('throttle:apikey:default', 'throttle:apikey:orders', 1, 0.02, 1, 0, 2, 0.001, 10, 10, 1000)
+    assert backend.acquire('apikey', {'default': 1}, buckets) == {}
+    backend.limit('apikey', 'default', -20, buckets)
+    script, count, args = client.calls[2]
+    assert script == RedisRateLimiterBackend.limit_script and count == 1
+    assert args == ('throttle:apikey:default', 0.02, 1, 0, -20, 1000)
+
+
+def test_throttler_backpressure():
+    async def run(clock):
+        throttler = Throttler({'refillRate': 1 / 2, 'capacity': 1, 'maxCapacity': 5, 'delay': 0})
+        futures = [throttler() for _ in range(7)]
+        try:
+            throttler()
+            assert False
+        except RuntimeError:
+            pass
+        await asyncio.gather(*futures)
+        throttler.config['backpressure'] = True
+        futures = [throttler(1, 'market') for _ in range(20)]
+        # calls over maxCapacity wait for room, a trading call is let in first
+        order = throttler(1, 'trading')
+        futures[-1].cancel()
+        start = clock.now
+        await order
+        assert clock.elapsed(start) == 4 and not futures[-2].done()
+        await asyncio.gather(*futures[:-1])
+        assert clock.elapsed(start) == 40
+        metrics = throttler.metrics()
+        assert metrics['released'] == 27
+        assert metrics['backpressured'] == 15
+        assert metrics['maxLength'] == 6
+        assert metrics['length'] == 0 and metrics['waiting'] == 0
+        assert metrics['maxWaitTime'] == 40 and metrics['averageWaitTime'] == 462 / 27
+    run_with_clock(run)
+
+
+def test_async_throttler():
+    test_throttler_paces_with_single_wakeups()
+    test_throttler_bursts_and_cancels()
+    test_throttler_priority_lanes()
+    test_throttler_uses_its_loop()
+    test_entry_sets_rate_limit_priority()
+    test_throttler_buckets()
+    test_throttler_follows_rate_limit_headers()
+    test_throttler_shares_backend()
+    test_throttler_backend_off_the_loop()
+    test_redis_rate_limiter_backend()
+    test_throttler_backpressure()
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import sys
+import threading
+
+import requests
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+# python only, fetch_many() and the threaded pagination are not transpiled
+
+
+class SampleExchange(ccxt.Exchange):
+    def describe(self):
+        return self.deep_extend(super(SampleExchange, self).describe(), {
+            'id': 'sample',
+            'rateLimit': 1,
+        })
+
+    def track(self, barrier=None):
+        # counts the calls that run at once, a barrier holds them until that many run together
+        self.lock = threading.Lock()
+        self.barrier = barrier
+        self.active = 0
+        self.most = 0
+        self.sessions = set()
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        # one candle per minute from since
+        paginate, params = self.handle_option_and_params(params, 'fetchOHLCV', 'paginate', False)
+        if paginate:
+            return self.fetch_paginated_call_deterministic('fetchOHLCV', symbol, since, limit, timeframe, params, 10)
+        with self.lock:
+            self.active += 1
+            self.most = max(self.most, self.active)
+        if self.barrier is not None:
+            self.barrier.wait(10)
+        self.sessions.add(id(self.get_session()))
+        with self.lock:
+            self.active -= 1
+        return [[since + i * 60000 + 1, 1, 1, 1, 1, 1] for i in range(limit)]
+
+
+def test_fetch_many_threads():
+    for threads in [1, 4]:
+        exchange = SampleExchange({'options': {'threads': threads}})
+        exchange.track(threading.Barrier(threads) if threads > 1 else None)
+        results = exchange.fetch_many('fetchOHLCV', [['BTC/USDT', '1m', since, 2] for since in range(0, 8 * 60000, 60000)])
+        assert [result[0][0] for result in results] == list(range(1, 8 * 60000, 60000))
+        # the calls only pass the barrier if all threads run them at once
+        assert exchange.most == threads
+        if threads == 1:
+            assert exchange.sessions == {id(exchange.session)}
+        else:
+            # every worker thread has its own session
+            assert len(exchange.sessions) == 4 and id(exchange.session) not in exchange.sessions
+            assert threading.current_thread() is threading.main_thread()
+        exchange.close()
+
+
+def test_paginated_calls_run_on_threads():
+    exchange = SampleExchange({'options': {'threads': 5, 'paginationCalls': 5}})
+    exchange.track(threading.Barrier(5))
+    since = exchange.milliseconds() - 60 * 60000
+    # the pagination of the generated methods runs on the threads
+    candles = exchange.fetch_ohlcv('BTC/USDT', '1m', since, None, {'paginate': True})
+    assert exchange.most == 5
+    timestamps = [candle[0] for candle in candles]
+    assert timestamps == sorted(timestamps) and len(timestamps) == 50
+    exchange.close()
+    # the same windows as the generated version, which makes the calls one after another
+    exchange = SampleExchange({'options': {'paginationCalls': 5}})
+    exchange.track()
+    assert len(exchange.fetch_ohlcv('BTC/USDT', '1m', since, None, {'paginate': True})) == 50
+    assert exchange.most == 1
+    exchange.close()
+
+
+def test_worker_sessions_copy_the_session():
+    session = requests.Session()
+    session.proxies = {'https': 'http://127.0.0.1:3128'}
+    session.verify = False
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=20)
+    session.mount('https://', adapter)
+    exchange = SampleExchange({'session': session, 'options': {'threads': 2}})
+    exchange.track(threading.Barrier(2))
+    exchange.fetch_many('fetchOHLCV', [['BTC/USDT', '1m', 0, 1], ['BTC/USDT', '1m', 60000, 1]])
+    assert len(exchange.worker_sessions) == 2
+    for worker in exchange.worker_sessions:
+        assert worker is not session and worker.proxies == session.proxies and worker.verify is False
+        assert worker.get_adapter('https://example.com') is adapter
+        # the headers are copied, a request of one thread does not change the others
+        assert worker.headers == session.headers and worker.headers is not session.headers
+    workers = exchange.worker_sessions
+    closed = []
+    for worker in workers:
+        worker.close = lambda worker=worker: closed.append(worker)
+    exchange.close()
+    assert closed == workers and exchange.executor is None and exchange.worker_sessions is None
+
+
+def test_async_fetch_many():
+    async def run():
+        exchange = ccxt.async_support.Exchange({'id': 'sample'})
+        started = []
+
+        async def fetch_ticker(symbol):
+            started.append(symbol)
+            await asyncio.sleep(0)
+            # both calls started before the first one returns
+            assert started == ['BTC/USDT', 'ETH/USDT']
+            return symbol
+
+        exchange.fetch_ticker = fetch_ticker
+        assert await exchange.fetch_many('fetch_ticker', [['BTC/USDT'], ['ETH/USDT']]) == ['BTC/USDT', 'ETH/USDT']
+        await exchange.close()
+    asyncio.run(run())
+
+
+def test_fetch_many():
+    test_fetch_many_threads()
+    test_paginated_calls_run_on_threads()
+    test_worker_sessions_copy_the_session()
+    test_async_fetch_many()
@@ -0,0 +1,103 @@
+import asyncio
+import http.server
+import os
+import sys
+import threading
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+# python only, the http sessions are not transpiled
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_HEAD(self):
+        Handler.connections.add(self.client_address)
+        self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        Handler.connections.add(self.client_address)
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def count_connections(exchange, url, requests):
+    Handler.connections = set()
+    for _ in range(requests):
+        assert exchange.fetch(url) == {'ok': True}
+    return len(Handler.connections)
+
+
+def test_http_session_pool():
+    exchange = ccxt.Exchange({'id': 'sample', 'options': {'http': {'poolMaxsize': 32, 'maxRetries': 2}}})
+    adapter = exchange.session.get_adapter('https://example.com')
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 2
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = 'http://127.0.0.1:' + str(server.server_address[1]) + '/'
+        # the warm connection is reused
+        assert count_connections(exchange, url, 5) == 1
+        closing = ccxt.Exchange({'id': 'sample', 'options': {'http': {'keepAlive': False}}})
+        assert count_connections(closing, url, 3) == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_tcp_connector_warmup():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = str(server.server_address[1])
+
+    async def run():
+        exchange = ccxt.async_support.Exchange({
+            'id': 'sample',
+            'hostname': '127.0.0.1',
+            'urls': {'api': {
+                'public': 'http://{hostname}:' + port + '/api/v3',
+                'private': 'http://127.0.0.1:' + port + '/sapi',
+                'down': 'http://127.0.0.1:1/api',
+            }},
+            'options': {'http': {'limitPerHost': 4, 'keepaliveTimeout': 30, 'ttlDnsCache': None}},
+        })
+        try:
+            assert exchange.rest_hosts() == ['http://127.0.0.1:' + port, 'http://127.0.0.1:1']
+            Handler.connections = set()
+            assert await exchange.warmup(2) == ['http://127.0.0.1:' + port]
+            assert exchange.tcp_connector.limit_per_host == 4
+            assert len(Handler.connections) == 2
+            # the first request goes over a warm connection
+            assert await exchange.fetch('http://127.0.0.1:' + port + '/api/v3/time') == {'ok': True}
+            assert len(Handler.connections) == 2
+        finally:
+            await exchange.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_http_session():
+    test_http_session_pool()
+    test_tcp_connector_warmup()
@@ -0,0 +1,99 @@
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+from ccxt.base import throttler  # noqa: E402
+
+# python only, the synchronous throttler is not transpiled
+
+
+class Clock:
+    # replaces the time module of the throttler, sleep() moves the time forward instead of waiting
+    def __init__(self):
+        self.now = 1000.0
+        self.lock = threading.Lock()
+
+    def time(self):
+        with self.lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.now += seconds
+
+
+@contextmanager
+def patched_clock():
+    clock = Clock()
+    original = throttler.time
+    throttler.time = clock
+    try:
+        yield clock
+    finally:
+        throttler.time = original
+
+
+def releases(exchange, clock, count):
+    start = clock.time()
+    result = []
+    for _ in range(count):
+        exchange.throttle(1)
+        result.append(round((clock.time() - start) * 1000, 6))
+    return result
+
+
+def test_throttle_paces_calls():
+    with patched_clock() as clock:
+        exchange = ccxt.Exchange({'id': 'sample', 'rateLimit': 20, 'tokenBucket': {'capacity': 3, 'tokens': 2}})
+        # a burst of three, then one call every 20 ms
+        assert releases(exchange, clock, 6) == [0, 0, 0, 20, 40, 60]
+        try:
+            exchange.throttle({'orders': 1})
+            assert False
+        except ValueError:
+            pass
+
+
+def test_throttle_follows_rate_limit():
+    with patched_clock() as clock:
+        exchange = ccxt.Exchange({'id': 'sample', 'rateLimit': 20})
+        assert releases(exchange, clock, 2) == [0, 20]
+        # like examples/py/kraken-fetch-my-trades-pagination.py
+        exchange.rateLimit = 10000
+        assert releases(exchange, clock, 2) == [10000, 20000]
+
+
+def test_throttle_threads():
+    with patched_clock() as clock:
+        exchange = ccxt.Exchange({'id': 'sample', 'rateLimit': 20, 'tokenBucket': {'capacity': 3, 'tokens': 2}})
+        start = clock.time()
+        times = []
+        lock = threading.Lock()
+
+        def call():
+            for _ in range(3):
+                exchange.throttle(1)
+                with lock:
+                    times.append((clock.time() - start) * 1000)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        times.sort()
+        assert len(times) == 12
+        # the sleeps of the threads add up on the clock, but no call goes through before its token is back
+        for index, elapsed in enumerate(times):
+            assert index < 3 + elapsed / 20 + 1e-6
+
+
+def test_throttle():
+    test_throttle_paces_calls()
+    test_throttle_follows_rate_limit()
+    test_throttle_threads()
@@ -8,6 +8,10 @@ except ImportError:
     asyncio = None
 
 from base.tests_init import base_tests_init  # noqa: F401
+from base.test_throttle import test_throttle  # noqa: F401
+from base.test_async_throttler import test_async_throttler  # noqa: F401
+from base.test_fetch_many import test_fetch_many  # noqa: F401
+from base.test_http_session import test_http_session  # noqa: F401
 from ccxt.pro.test.base.tests_init import test_base_init_ws  # noqa: F401
 
 # fix : https://github.com/aio-libs/aiodns/issues/86
@@ -27,6 +31,11 @@ if (isBaseTests):
         print('base WS tests passed!')
     else:
         base_tests_init()
+        # the python only tests, base_tests_init() is generated
+        test_throttle()
+        test_async_throttler()
+        test_fetch_many()
+        test_http_session()
         print('base REST tests passed!')
     if not runAll:
         exit(0)
@@ -156,6 +156,8 @@ export default class binance extends binanceRest {
                 'listenKeyRefreshRate': 1200000, // 20 mins
                 'ws': {
                     'cost': 5,
+                    'orderBookDeletes': true, // the depth stream deletes every level it drops, see orderBookDepthView
+                    'maxSubscriptionsPerConnection': 1024,
                 },
                 'tickerChannelsMap': {
                     '24hrTicker': 'ticker',
@@ -56,6 +56,9 @@ export default class bitget extends bitgetRest {
             },
             'options': {
                 'tradesLimit': 1000,
+                'ws': {
+                    'maxSubscriptionsPerConnection': 1000,
+                },
                 'OHLCVLimit': 1000,
                 // WS timeframes differ from REST timeframes
                 'timeframes': {